@@ -0,0 +1,101 @@
+"""
+Reproducible synthetic inputs for the snippet benchmarks.
+
+Every generator is seeded, so the same parameters always produce the same
+file. Generated files are cached in bench/data/ and only rebuilt when
+missing.
+"""
+
+import csv
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+SEED = 42
+
+CATEGORIES = ["books", "food", "garden", "music", "tools", "toys", "travel"]
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf",
+         "hotel", "india", "juliett", "kilo", "lima", "mike", "november"]
+
+
+def csv_file(rows, delimiter=","):
+    """CSV with a header and `rows` records of mixed column types.
+
+    The note column sometimes contains the delimiter and quotes, so the
+    parser has to deal with quoting as in real exports.
+    """
+    names = {",": "comma", "\t": "tab", ";": "semicolon", "|": "pipe"}
+    path = DATA_DIR / f"rows-{rows}-{names.get(delimiter, 'custom')}.csv"
+    if path.exists():
+        return path
+
+    rng = random.Random(SEED)
+    start = date(2020, 1, 1)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(["id", "name", "amount", "date", "category", "note"])
+        for i in range(rows):
+            note = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+            if rng.random() < 0.05:
+                note = f'{note}{delimiter} "quoted"'
+            writer.writerow([
+                i,
+                f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}",
+                f"{rng.uniform(-1000, 10000):.2f}",
+                (start + timedelta(days=rng.randint(0, 2000))).isoformat(),
+                rng.choice(CATEGORIES),
+                note,
+            ])
+    return path
+
+
+def json_file(depth, breadth):
+    """JSON document nested `depth` levels deep with `breadth` keys per object."""
+    path = DATA_DIR / f"json-d{depth}-b{breadth}.json"
+    if path.exists():
+        return path
+
+    rng = random.Random(SEED)
+
+    def node(level):
+        if level == depth:
+            return rng.choice([
+                rng.randint(-10 ** 6, 10 ** 6),
+                round(rng.uniform(-1, 1), 6),
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))),
+                rng.random() < 0.5,
+                None,
+            ])
+        if level % 2:
+            return [node(level + 1) for _ in range(breadth)]
+        return {f"{rng.choice(WORDS)}_{i}": node(level + 1) for i in range(breadth)}
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(node(0), f, separators=(",", ":"))
+    return path
+
+
+def todo_store(items):
+    """todos.json in the format of snippets/todo.py with `items` entries."""
+    path = DATA_DIR / f"todos-{items}.json"
+    if path.exists():
+        return path
+
+    rng = random.Random(SEED)
+    statuses = ["todo", "in progress", "completed"]
+    todos = [{
+        "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))),
+        "status": rng.choice(statuses),
+        "priority": priority,
+        "date": f"{rng.randint(1, 28):02d} Jan {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+    } for priority in range(1, items + 1)]
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(todos, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Snippet benchmark harness.
+
+Runs csv_to_excel, json_formatter and todo against reproducible synthetic
+inputs (see datasets.py) and reports throughput, peak memory and the change
+against a stored baseline.
+
+Every case runs in a fresh interpreter with the snippet's REQUIRES already
+imported, so timings cover the snippet's own work and peak RSS is per case.
+Snippets run from a temporary copy of snippets/, so todo never touches your
+real todo list.
+
+Usage:
+  python bench/run_bench.py                      # small + medium cases
+  python bench/run_bench.py --size large         # everything, incl. 1M rows
+  python bench/run_bench.py --cases csv_to_excel # only matching cases
+  python bench/run_bench.py --save-baseline      # store results as baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+import datasets  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+SIZES = ["small", "medium", "large"]
+
+# (label, size tier, dataset parameters...)
+CSV_CASES = [
+    ("1k-comma", "small", 1_000, ",", "out.xlsx", []),
+    ("1k-tab", "small", 1_000, "\t", "out.xlsx", []),
+    ("100k-comma", "medium", 100_000, ",", "out.xlsx", []),
+    ("100k-semicolon", "medium", 100_000, ";", "out.xlsx", []),
+    ("100k-comma-stream", "medium", 100_000, ",", "out.xlsx", ["--stream"]),
+    ("100k-comma-xml", "medium", 100_000, ",", "out.xlsx", ["--writer=xml"]),
+    ("100k-comma-xml-strings", "medium", 100_000, ",", "out.xlsx", ["--writer=xml", "--strings"]),
+    ("100k-comma-xml-pyarrow", "medium", 100_000, ",", "out.xlsx", ["--writer=xml", "--engine=auto"]),
+    ("100k-comma-xml-mmap", "medium", 100_000, ",", "out.xlsx", ["--writer=xml", "--mmap"]),
+    ("100k-comma-xml-ranges", "medium", 100_000, ",", "out.xlsx", ["--writer=xml", "--ranges=4"]),
+    ("100k-comma-to-tsv", "medium", 100_000, ",", "out.tsv", ["tab"]),
+    ("100k-comma-to-tsv-mmap", "medium", 100_000, ",", "out.tsv", ["tab", "--mmap"]),
+    ("1m-pipe", "large", 1_000_000, "|", "out.xlsx", []),
+    ("1m-pipe-xml", "large", 1_000_000, "|", "out.xlsx", ["--writer=xml"]),
+    ("1m-pipe-to-csv", "large", 1_000_000, "|", "out.csv", ["comma"]),
+    ("1m-pipe-to-csv-mmap", "large", 1_000_000, "|", "out.csv", ["comma", "--mmap"]),
+    ("1m-pipe-ranges", "large", 1_000_000, "|", "out.xlsx", ["--writer=xml", "--ranges=4"]),
+]
+JSON_CASES = [
+    ("small", "small", 4, 6),
+    ("deep", "medium", 10, 3),
+    ("wide", "medium", 3, 60),
+]
+TODO_CASES = [
+    ("10", "small", 10),
+    ("10k", "medium", 10_000),
+    ("100k", "large", 100_000),
+]
+DELIMITER_NAMES = {",": "comma", "\t": "tab", ";": "semicolon", "|": "pipe"}
+
+# Operations per todo case: one list, then add/status/remove rounds
+TODO_ROUNDS = 5
+
+
+def build_cases(max_size):
+    """Return the benchmark cases up to the given size tier."""
+    allowed = SIZES[:SIZES.index(max_size) + 1]
+    cases = []
+
+    for label, size, rows, delimiter, output, options in CSV_CASES:
+        if size in allowed:
+            cases.append({'name': f"csv_to_excel/{label}", 'snippet': "csv_to_excel",
+                          'kind': "csv", 'rows': rows, 'delimiter': delimiter,
+                          'output': output, 'options': options})
+
+    for label, size, depth, breadth in JSON_CASES:
+        if size in allowed:
+            cases.append({'name': f"json_formatter/{label}", 'snippet': "json_formatter",
+                          'kind': "json", 'depth': depth, 'breadth': breadth})
+
+    for label, size, items in TODO_CASES:
+        if size in allowed:
+            cases.append({'name': f"todo/{label}", 'snippet': "todo",
+                          'kind': "todo", 'items': items})
+
+    return cases
+
+
+def prepare(case, workdir):
+    """Generate the case's input and return (commands, amount, unit, input MB)."""
+    if case['kind'] == "csv":
+        source = datasets.csv_file(case['rows'], case['delimiter'])
+        output = workdir / case['output']
+        commands = [[str(source), str(output), DELIMITER_NAMES[case['delimiter']]] + case['options']]
+        return commands, case['rows'], "rows", source.stat().st_size / 1e6
+
+    if case['kind'] == "json":
+        source = datasets.json_file(case['depth'], case['breadth'])
+        size_mb = source.stat().st_size / 1e6
+        return [[str(source)]], size_mb, "MB", size_mb
+
+    store = datasets.todo_store(case['items'])
+    data_dir = workdir / "snippets" / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copy(store, data_dir / "todos.json")
+
+    commands = [["list"]]
+    for n in range(TODO_ROUNDS):
+        commands.append(["add", "Benchmark", f"task-{n}"])
+        commands.append(["status", str(n + 1), "done"])
+        commands.append(["remove", str(n + 2)])
+    return commands, len(commands), "ops", store.stat().st_size / 1e6
+
+
+def run_case(case):
+    """Run one case in this process and return its measurements."""
+    import runner
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        shutil.copytree(ROOT / "snippets", workdir / "snippets",
+                        ignore=shutil.ignore_patterns("data", "__index__", "__pycache__"))
+        commands, amount, unit, input_mb = prepare(case, workdir)
+
+        snippet_runner = runner.SnippetRunner(workdir / "snippets", metrics=False)
+        snippet = snippet_runner.find_snippet(case['snippet'])
+        for name in snippet['requires']:
+            __import__(name)
+
+        ok = True
+        sys.stdin = io.StringIO()
+        measurement = runner.Measurement()
+        with contextlib.redirect_stdout(io.StringIO()), measurement:
+            for args in commands:
+                ok = snippet_runner.invoke(snippet, args) and ok
+
+    result = {'ok': ok, 'amount': amount, 'unit': unit, 'input_mb': input_mb}
+    result.update(measurement.as_record())
+    return result
+
+
+def run_case_isolated(case):
+    """Run a case in a fresh interpreter so memory and imports are per case."""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--run-case", json.dumps(case)],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def throughput_change(current, baseline):
+    """Throughput change against the baseline in percent, or None."""
+    if baseline is None or not baseline.get('throughput'):
+        return None
+    return (current['throughput'] / baseline['throughput'] - 1) * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bundled snippets.")
+    parser.add_argument("--size", choices=SIZES, default="medium",
+                        help="largest dataset tier to run (default: medium)")
+    parser.add_argument("--cases", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: bench/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="flag throughput drops larger than this percentage (default: 10)")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.run_case:
+        print(json.dumps(run_case(json.loads(options.run_case))))
+        return 0
+
+    cases = build_cases(options.size)
+    if options.cases:
+        cases = [case for case in cases if options.cases in case['name']]
+
+    baseline = {}
+    if options.baseline.exists():
+        baseline = json.loads(options.baseline.read_text(encoding="utf-8"))
+
+    print(f"{'CASE':<40} {'TIME':>9} {'THROUGHPUT':>16} {'MB/s':>8} {'PEAK RSS':>10} {'VS BASE':>9}")
+    print("=" * 98)
+
+    results = {}
+    regressions = 0
+    for case in cases:
+        result = run_case_isolated(case)
+        result['throughput'] = result['amount'] / result['wall_s']
+        results[case['name']] = result
+
+        change = throughput_change(result, baseline.get(case['name']))
+        delta = "      n/a" if change is None else f"{change:+8.1f}%"
+        flag = ""
+        if not result['ok']:
+            flag = "  ❌ failed"
+        elif change is not None and change < -options.threshold:
+            flag = "  ⚠️  regression"
+            regressions += 1
+
+        print(f"{case['name']:<40} {result['wall_s']:>8.3f}s "
+              f"{result['throughput']:>11,.0f} {result['unit'] + '/s':<4} "
+              f"{result['input_mb'] / result['wall_s']:>8.1f} "
+              f"{result['peak_rss_mb'] or 0:>7.1f} MB {delta}{flag}")
+
+    print("=" * 98)
+    if regressions:
+        print(f"⚠️  {regressions} case(s) more than {options.threshold:.0f}% slower than the baseline")
+
+    if options.save_baseline:
+        baseline.update(results)
+        options.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n",
+                                    encoding="utf-8")
+        print(f"💾 Baseline saved to {options.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the snippet runner.
+
+Generates directories of 10, 100 and 1000 synthetic snippets and measures
+cold startup (fresh interpreter, load_snippets() + show_menu()) for:
+
+  import  - executing every snippet module (the original behaviour)
+  scan    - AST metadata scan with no index on disk
+  index   - validating an existing snippets/__index__
+
+Usage:
+  python bench/startup.py [--counts 10,100,1000] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SNIPPET_TEMPLATE = '''"""
+Synthetic snippet {n}
+"""
+
+import json
+import csv
+
+TITLE = "Synthetic Tool {n:04d}"
+
+DESCRIPTION = """Synthetic snippet used by the startup benchmark.
+
+Usage:
+  <input> <output> [delimiter]
+
+Examples:
+  data.csv output.json
+  data.csv output.json comma
+"""
+
+
+def run(args):
+    """Convert a CSV file to JSON."""
+    if len(args) < 2:
+        print("❌ Error: Expected 2 arguments")
+        return False
+
+    delimiter = {{'tab': '\\t', 'comma': ','}}.get(args[2] if len(args) > 2 else 'tab')
+    with open(args[0], newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f, delimiter=delimiter))
+    with open(args[1], 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2)
+    print(f"✅ Converted {{len(rows)}} rows")
+'''
+
+CHILD = textwrap.dedent('''
+    import sys, time, contextlib, io
+    sys.path.insert(0, {root!r})
+    start = time.perf_counter()
+    import runner
+    r = runner.SnippetRunner({snippets_dir!r})
+    with contextlib.redirect_stdout(io.StringIO()):
+        if {mode!r} == "import":
+            for path in sorted(r.snippets_dir.glob("*.py")):
+                runner.import_module_from_path(path)
+        else:
+            r.load_snippets()
+            r.show_menu()
+    print(time.perf_counter() - start)
+''')
+
+
+def make_snippets(directory, count):
+    for n in range(count):
+        (directory / f"tool_{n:04d}.py").write_text(SNIPPET_TEMPLATE.format(n=n), encoding='utf-8')
+
+
+def time_startup(snippets_dir, mode):
+    """Run one cold startup in a fresh interpreter and return its duration."""
+    index_file = snippets_dir / "__index__"
+    if mode == "scan" and index_file.exists():
+        index_file.unlink()
+
+    code = CHILD.format(root=str(ROOT), snippets_dir=str(snippets_dir), mode=mode)
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    counts = [int(c) for c in options.counts.split(",")]
+    modes = ["import", "scan", "index"]
+
+    print(f"{'SNIPPETS':>8}  " + "  ".join(f"{mode:>10}" for mode in modes) + "   (median ms)")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            snippets_dir = Path(tmp)
+            make_snippets(snippets_dir, count)
+
+            timings = {}
+            for mode in modes:
+                if mode == "index":
+                    # Build the index once, then measure validation only
+                    time_startup(snippets_dir, "scan")
+                samples = [time_startup(snippets_dir, mode) for _ in range(options.repeat)]
+                timings[mode] = statistics.median(samples) * 1000
+
+        print(f"{count:>8}  " + "  ".join(f"{timings[mode]:>10.1f}" for mode in modes))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,44 +6,785 @@ A simple tool to manage and execute Python snippets interactively.
 
 import os
 import sys
+import argparse
+import json
+import functools
+import time
+import io
+import contextlib
+import threading
+from datetime import datetime
+import socket
+import tempfile
 import importlib.util
 from pathlib import Path
 
+# ast, hashlib, cProfile, pstats, tracemalloc and concurrent.futures are
+# imported where they are used, so the 'client' command starts quickly
+
+
+# Module-level names the runner reads from snippets
+METADATA_NAMES = ('TITLE', 'DESCRIPTION', 'REQUIRES')
+
+# Stale snippets needed before they are scanned on a thread pool. Parsing
+# holds the GIL, so on a local disk the pool only breaks even around this
+# size (bench/startup.py); it pays off on slow, high-latency file systems
+SCAN_POOL_MIN_FILES = 1000
+
+# Seconds between resident set size samples while a snippet runs
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+def bound_names(node):
+    """Return the module-level names a statement can bind or delete.
+
+    Function, class and lambda bodies are not entered since they have their
+    own scope. A star import is reported as '*'.
+    """
+    import ast
+
+    names = set()
+    stack = [node]
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(child.name)
+            continue
+        if isinstance(child, ast.Lambda):
+            continue
+        if isinstance(child, ast.Name) and isinstance(child.ctx, (ast.Store, ast.Del)):
+            names.add(child.id)
+        elif isinstance(child, (ast.Import, ast.ImportFrom)):
+            for alias in child.names:
+                names.add(alias.asname or alias.name.split('.')[0])
+        stack.extend(ast.iter_child_nodes(child))
+    return names
+
+
+def read_metadata(tree):
+    """Extract snippet metadata from a parsed module without executing it.
+
+    Returns a dict with the literal values of TITLE, DESCRIPTION and
+    REQUIRES (when present) and 'run' set to True if a top-level run()
+    function exists.
+    Returns None if any of these names is bound in a way that can only be
+    known by executing the module: imports, augmented or tuple assignments,
+    non-literal values, or bindings inside if/try/with/loop blocks.
+    """
+    import ast
+
+    metadata = {'run': False}
+    watched = set(METADATA_NAMES) | {'run'}
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == 'run':
+            metadata['run'] = True
+            continue
+
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            targets = None
+
+        if (targets is None or not all(isinstance(target, ast.Name) for target in targets)
+                or bound_names(node.value) & watched):
+            names = bound_names(node)
+            if '*' in names or names & watched:
+                return None
+            continue
+
+        for target in targets:
+            if target.id == 'run':
+                return None
+            if target.id in METADATA_NAMES:
+                try:
+                    metadata[target.id] = ast.literal_eval(node.value)
+                except (ValueError, TypeError, SyntaxError):
+                    return None
+
+    return metadata
+
+
+def new_entry(py_file, stat, sha256):
+    """Create an index entry for a file that is not (yet) known to be a snippet."""
+    return {
+        'name': py_file.stem,
+        'title': None,
+        'description': None,
+        'requires': [],
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256
+    }
+
+
+def scan_source(py_file, stat, entry=None):
+    """Read, hash and parse a snippet file without executing it.
+
+    Safe to run on worker threads. Returns the updated index entry (reusing
+    entry if the content hash is unchanged), with a title of None if the file
+    is not a valid snippet. Returns None if the module has to be imported to
+    learn its metadata.
+    """
+    import ast
+    import hashlib
+
+    source = py_file.read_bytes()
+    sha256 = hashlib.sha256(source).hexdigest()
+
+    if entry is not None and entry['sha256'] == sha256:
+        return dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+    tree = compile(source, str(py_file), 'exec', ast.PyCF_ONLY_AST)
+    metadata = read_metadata(tree)
+    if metadata is None:
+        return None
+
+    entry = new_entry(py_file, stat, sha256)
+    if 'TITLE' in metadata and 'DESCRIPTION' in metadata and metadata['run']:
+        entry['title'] = metadata['TITLE']
+        entry['description'] = metadata['DESCRIPTION']
+        entry['requires'] = requires_list(metadata.get('REQUIRES'))
+    return entry
+
+
+def requires_list(requires):
+    """Normalize a snippet's REQUIRES value to a list of module names."""
+    if isinstance(requires, str):
+        return [requires]
+    if isinstance(requires, (list, tuple)):
+        return [str(name) for name in requires]
+    return []
+
+
+def prewarm_imports(names):
+    """Import modules in a background thread so a later import is instant.
+
+    Import errors are ignored here; the snippet reports them when it runs.
+    Returns the started thread, or None if everything is already imported.
+    """
+    names = [name for name in names if name not in sys.modules]
+    if not names:
+        return None
+
+    def warm():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=warm, name="snippet-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def module_name_free(name, path):
+    """Whether a snippet at path can be registered in sys.modules as name.
+
+    False if the name belongs to another module, loaded or importable (e.g.
+    a snippet called secrets.py must not hide the stdlib secrets module).
+    """
+    path = os.path.realpath(path)
+    existing = sys.modules.get(name)
+    if existing is not None:
+        return os.path.realpath(getattr(existing, '__file__', None) or '') == path
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return False
+    return spec is None or os.path.realpath(spec.origin or '') == path
+
+
+def import_module_from_path(path):
+    """Execute a snippet file and return the resulting module.
+
+    The module is registered in sys.modules under its file name, so its
+    functions can be pickled (e.g. for process pools), unless that name
+    belongs to another module (see module_name_free).
+    """
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+
+    register = module_name_free(spec.name, path)
+    if register:
+        sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        if register:
+            sys.modules.pop(spec.name, None)
+        raise
+    return module
+
+
+def read_manifest(path):
+    """Read a JSONL batch manifest.
+
+    Each non-blank line is an object like {"snippet": "csv_to_excel",
+    "args": ["data.csv", "out.xlsx", "comma"]}; args may also be a command
+    string, which is split on whitespace as in the menu. Returns a list of
+    job dicts with 'line', 'snippet', 'args' and 'error' (None if valid).
+    """
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            job = {'line': line_no, 'snippet': None, 'args': [], 'error': None}
+            try:
+                spec = json.loads(line)
+                if not isinstance(spec, dict) or not isinstance(spec.get('snippet'), str):
+                    raise ValueError("expected an object with a 'snippet' name")
+
+                args = spec.get('args', [])
+                if isinstance(args, str):
+                    args = args.split()
+                elif not isinstance(args, list):
+                    raise ValueError("'args' must be a list or a string")
+
+                job['snippet'] = spec['snippet']
+                job['args'] = [str(arg) for arg in args]
+            except ValueError as e:
+                job['error'] = f"Invalid manifest line {line_no}: {e}"
+
+            jobs.append(job)
+
+    return jobs
+
+
+def describe_job(job):
+    """One-line description of a batch job for progress and summaries."""
+    if job['snippet'] is None:
+        return f"line {job['line']}"
+    return " ".join([job['snippet']] + job['args'])
+
+
+def print_batch_summary(results, elapsed):
+    """Print per-job results and totals for a batch run."""
+    failed = [(job, seconds) for job, ok, seconds in results if not ok]
+
+    print("\n" + "=" * 60)
+    print("  BATCH SUMMARY")
+    print("=" * 60)
+    for job, ok, seconds in results:
+        print(f"  {'✅' if ok else '❌'} {seconds:7.2f}s  {describe_job(job)}")
+    print("=" * 60)
+    print(f"  {len(results) - len(failed)} succeeded, {len(failed)} failed "
+          f"in {elapsed:.2f}s")
+
+
+def max_rss_mb():
+    """Peak resident set size over this process's lifetime in MB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB, or None where /proc is missing."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class Measurement:
+    """Wall time, CPU time and memory use of one snippet invocation.
+
+    ru_maxrss is a peak over the whole process, so a run that stays below an
+    earlier run's peak would report the earlier value. The current RSS is
+    sampled on a thread during the run instead; when the process peak grew
+    during the run, that (exact) peak is the run's own.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.wall_s = None
+        self.cpu_s = None
+        self.peak_rss_mb = None
+        self.traced_peak_mb = None
+
+    def __enter__(self):
+        if self.trace_memory:
+            import tracemalloc
+
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+
+        self._max_rss = max_rss_mb()
+        self._sampled_rss = current_rss_mb()
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        if self._sampled_rss is not None:
+            self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self._sampler.start()
+
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall_s = time.perf_counter() - self._wall
+        self.cpu_s = time.process_time() - self._cpu
+
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampled_rss = max(self._sampled_rss, current_rss_mb() or 0)
+        max_rss = max_rss_mb()
+        if max_rss is not None and self._max_rss is not None and max_rss > self._max_rss:
+            self.peak_rss_mb = max_rss
+        else:
+            self.peak_rss_mb = self._sampled_rss
+
+        if self.trace_memory:
+            import tracemalloc
+
+            self.traced_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def _sample_rss(self):
+        while not self._stop_sampling.wait(RSS_SAMPLE_INTERVAL):
+            rss = current_rss_mb()
+            if rss is not None and rss > self._sampled_rss:
+                self._sampled_rss = rss
+
+    def summary(self):
+        """One-line human readable summary."""
+        parts = [f"{self.wall_s:.3f}s wall", f"{self.cpu_s:.3f}s CPU"]
+        if self.peak_rss_mb is not None:
+            parts.append(f"peak RSS {self.peak_rss_mb:.1f} MB")
+        if self.traced_peak_mb is not None:
+            parts.append(f"traced peak {self.traced_peak_mb:.1f} MB")
+        return " · ".join(parts)
+
+    def as_record(self):
+        return {
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'peak_rss_mb': None if self.peak_rss_mb is None else round(self.peak_rss_mb, 3),
+            'traced_peak_mb': None if self.traced_peak_mb is None else round(self.traced_peak_mb, 3),
+        }
+
+
+# Per-process state of batch pool workers: (runner, loaded snippets)
+_batch_worker = None
+
+
+def init_batch_worker(runner_options, names):
+    """Process pool initializer: pre-import the snippets used by the batch."""
+    global _batch_worker
+
+    # Jobs can't prompt for input in a worker
+    sys.stdin = open(os.devnull, 'r')
+
+    runner = SnippetRunner(**runner_options)
+    loaded = {}
+    for name in names:
+        # Load errors are reported again by the jobs that need the snippet
+        with contextlib.redirect_stdout(io.StringIO()):
+            snippet = runner.find_snippet(name)
+        if snippet is not None:
+            loaded[name] = snippet
+
+    _batch_worker = (runner, loaded)
+
+
+def run_batch_job(job):
+    """Run one batch job in a pool worker, returning (ok, seconds, output)."""
+    runner, loaded = _batch_worker
+    output = io.StringIO()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        ok = runner.run_job(job, loaded)
+
+    return ok, time.perf_counter() - start, output.getvalue()
+
+
+def default_socket_path():
+    """Unix socket used by 'serve' and 'client' when none is given."""
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, 'getuid') else "user"
+    return os.path.join(base, f"snippet-runner-{user}.sock")
+
+
+def socket_in_use(socket_path):
+    """Check whether something is listening on a Unix socket path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class SocketStream(io.TextIOBase):
+    """Text stream that forwards writes to a client as JSON line frames."""
+
+    def __init__(self, conn, channel):
+        self._conn = conn
+        self._channel = channel
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            frame = json.dumps({self._channel: text}) + "\n"
+            self._conn.sendall(frame.encode('utf-8'))
+        return len(text)
+
+
+def run_client(socket_path, name, args):
+    """Forward a snippet invocation to a running daemon and stream its output.
+
+    Returns the daemon's exit code, or None if no daemon is listening.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        return None
+
+    with conn:
+        request = {'snippet': name, 'args': args, 'cwd': os.getcwd()}
+        conn.sendall((json.dumps(request) + "\n").encode('utf-8'))
+
+        exit_code = 1
+        for line in conn.makefile('r', encoding='utf-8'):
+            frame = json.loads(line)
+            if 'out' in frame:
+                sys.stdout.write(frame['out'])
+                sys.stdout.flush()
+            elif 'err' in frame:
+                sys.stderr.write(frame['err'])
+                sys.stderr.flush()
+            elif 'exit' in frame:
+                exit_code = frame['exit']
+
+    return exit_code
+
 
 class SnippetRunner:
-    def __init__(self, snippets_dir="snippets"):
+    INDEX_FILE = "__index__"
+    INDEX_VERSION = 3
+
+    def __init__(self, snippets_dir="snippets", workers=None, metrics=True,
+                 metrics_log=None, trace_memory=False):
         self.snippets_dir = Path(snippets_dir)
+        # Threads used to scan modified snippets (None: pool default, 1: sequential)
+        self.workers = workers
+        # Per-invocation instrumentation (see invoke)
+        self.metrics = metrics
+        self.metrics_log = Path(metrics_log) if metrics_log else self.snippets_dir / "data" / "metrics.jsonl"
+        self.trace_memory = trace_memory
         self.snippets = []
+        # Discovery cache: file name -> index entry (see scan_source)
+        self._cache = None
+        # Imported modules: file name -> (sha256, module)
+        self._modules = {}
+
+    def options(self):
+        """Constructor arguments for an equivalent runner (e.g. in a worker)."""
+        return {
+            'snippets_dir': str(self.snippets_dir),
+            'workers': self.workers,
+            'metrics': self.metrics,
+            'metrics_log': str(self.metrics_log),
+            'trace_memory': self.trace_memory,
+        }
 
-    def load_snippets(self):
-        """Load all Python files from the snippets directory."""
+    def load_snippets(self, force=False):
+        """Load all Python files from the snippets directory.
+
+        Snippet metadata is kept in a persistent index (snippets/__index__)
+        and validated with a single directory scan: unchanged files (same
+        mtime and size, or same content hash) are reused, and only new or
+        modified files are parsed. Metadata is read from the source without
+        executing it, so snippet modules are only imported when selected
+        (see get_module). Pass force=True to ignore the index and rescan
+        everything.
+        """
         if not self.snippets_dir.exists():
             print(f"Creating snippets directory: {self.snippets_dir}")
             self.snippets_dir.mkdir(parents=True)
             return
 
+        if force:
+            self._cache = {}
+        elif self._cache is None:
+            self._cache = self._read_index()
+
+        cache = {}
+        stale = []
+        changed = force
+        with os.scandir(self.snippets_dir) as entries:
+            for dir_entry in entries:
+                name = dir_entry.name
+                if not name.endswith(".py") or name.startswith("_"):
+                    continue
+
+                try:
+                    if not dir_entry.is_file():
+                        continue
+                    stat = dir_entry.stat()
+                except OSError as e:
+                    print(f"Error loading {name}: {e}")
+                    continue
+
+                entry = self._cache.get(name)
+                if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                    stale.append((Path(dir_entry.path), stat, entry))
+                    continue
+
+                cache[name] = entry
+
+        if stale:
+            refreshed = self._scan_stale(stale)
+            cache.update(refreshed)
+            changed = changed or bool(refreshed)
+
+        # Files that disappeared are dropped along with their cache entries
+        changed = changed or cache.keys() != self._cache.keys()
+        self._cache = cache
+        if changed:
+            self._write_index()
+
         self.snippets = []
-        for py_file in self.snippets_dir.glob("*.py"):
-            if py_file.name.startswith("_"):
+        for name, entry in cache.items():
+            if entry['title'] is None:
                 continue
+            module = self._modules.get(name)
+            self.snippets.append({
+                'name': entry['name'],
+                'title': entry['title'],
+                'description': entry['description'],
+                'requires': entry['requires'],
+                'path': self.snippets_dir / name,
+                'sha256': entry['sha256'],
+                'module': module[1] if module and module[0] == entry['sha256'] else None
+            })
+
+        self.snippets.sort(key=lambda x: (x['title'], x['name']))
+
+    def _scan_stale(self, stale):
+        """Re-validate new or modified files, returning name -> index entry.
+
+        Files are read, hashed and parsed on a thread pool when there are at
+        least SCAN_POOL_MIN_FILES of them. Results and errors are still handled in file name
+        order on the calling thread, so output is deterministic.
+        """
+        stale.sort(key=lambda item: item[0].name)
 
+        if len(stale) >= SCAN_POOL_MIN_FILES and self.workers != 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                jobs = [pool.submit(scan_source, *item) for item in stale]
+            results = [job.result for job in jobs]
+        else:
+            results = [functools.partial(scan_source, *item) for item in stale]
+
+        entries = {}
+        for (py_file, stat, _), result in zip(stale, results):
             try:
-                spec = importlib.util.spec_from_file_location(py_file.stem, py_file)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                # Each snippet must have TITLE, DESCRIPTION, and run() function
-                if hasattr(module, 'TITLE') and hasattr(module, 'DESCRIPTION') and hasattr(module, 'run'):
-                    self.snippets.append({
-                        'name': py_file.stem,
-                        'title': module.TITLE,
-                        'description': module.DESCRIPTION,
-                        'module': module
-                    })
+                entry = result()
             except Exception as e:
                 print(f"Error loading {py_file.name}: {e}")
+                continue
+
+            if entry is None:
+                entry = self._import_snippet(py_file, stat)
+                if entry is None:
+                    continue
+
+            entries[py_file.name] = entry
+
+        return entries
+
+    def _import_snippet(self, py_file, stat):
+        """Import a single snippet file to read its metadata."""
+        import hashlib
+
+        try:
+            sha256 = hashlib.sha256(py_file.read_bytes()).hexdigest()
+            module = import_module_from_path(py_file)
+        except Exception as e:
+            print(f"Error loading {py_file.name}: {e}")
+            return None
+
+        self._modules[py_file.name] = (sha256, module)
+
+        entry = new_entry(py_file, stat, sha256)
+        # Each snippet must have TITLE, DESCRIPTION, and run() function
+        if hasattr(module, 'TITLE') and hasattr(module, 'DESCRIPTION') and hasattr(module, 'run'):
+            entry['title'] = module.TITLE
+            entry['description'] = module.DESCRIPTION
+            entry['requires'] = requires_list(getattr(module, 'REQUIRES', None))
+        return entry
+
+    def _read_index(self):
+        """Read the persistent snippet index, or return an empty one."""
+        try:
+            with open(self.snippets_dir / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(index, dict) or index.get('version') != self.INDEX_VERSION:
+            return {}
+        return index.get('snippets', {})
+
+    def _write_index(self):
+        """Persist the snippet index; failures (e.g. read-only dirs) are ignored."""
+        index_file = self.snippets_dir / self.INDEX_FILE
+        tmp_file = index_file.with_name(index_file.name + f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.INDEX_VERSION, 'snippets': self._cache}, f,
+                          indent=1, ensure_ascii=False)
+            os.replace(tmp_file, index_file)
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+
+    def get_module(self, snippet):
+        """Return the snippet's module, importing it on first use."""
+        if snippet['module'] is None:
+            snippet['module'] = import_module_from_path(snippet['path'])
+            self._modules[snippet['path'].name] = (snippet['sha256'], snippet['module'])
+        return snippet['module']
+
+    def find_snippet(self, name):
+        """Load a single snippet by file name without scanning the others.
 
-        self.snippets.sort(key=lambda x: x['title'])
+        Returns the snippet entry, or None (after printing why) if it does
+        not exist or is not a valid snippet.
+        """
+        if name.endswith(".py"):
+            name = name[:-3]
+        py_file = self.snippets_dir / f"{name}.py"
+
+        if not py_file.is_file():
+            print(f"❌ Error: Snippet '{name}' not found in {self.snippets_dir}")
+            return None
+
+        try:
+            module = import_module_from_path(py_file)
+        except Exception as e:
+            print(f"Error loading {py_file.name}: {e}")
+            return None
+
+        if not (hasattr(module, 'TITLE') and hasattr(module, 'DESCRIPTION') and hasattr(module, 'run')):
+            print(f"❌ Error: {py_file.name} is not a snippet (needs TITLE, DESCRIPTION and run())")
+            return None
+
+        return {
+            'name': name,
+            'title': module.TITLE,
+            'description': module.DESCRIPTION,
+            'requires': requires_list(getattr(module, 'REQUIRES', None)),
+            'path': py_file,
+            'sha256': None,
+            'module': module
+        }
+
+    def invoke(self, snippet, args, profile=False):
+        """Run a snippet with the given arguments.
+
+        Returns True on success. A snippet reports failure by raising or by
+        returning False from run(). Unless metrics are disabled, a one-line
+        timing/memory summary is printed to stderr and a record is appended
+        to the metrics log. With profile=True the run is wrapped in cProfile
+        (see report_profile).
+        """
+        profiler = None
+        if profile:
+            import cProfile
+            profiler = cProfile.Profile()
+        measurement = Measurement(self.trace_memory)
+        with measurement:
+            try:
+                if profiler is not None:
+                    profiler.enable()
+                ok = self.get_module(snippet).run(args) is not False
+            except Exception as e:
+                print(f"\n❌ Error: {e}")
+                ok = False
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+
+        if profiler is not None:
+            self.report_profile(snippet, profiler)
+
+        if self.metrics:
+            sys.stdout.flush()
+            print(f"\n⏱  {measurement.summary()}", file=sys.stderr)
+            self.log_metrics(snippet, args, ok, measurement)
+
+        return ok
+
+    def report_profile(self, snippet, profiler, limit=15):
+        """Print the hottest functions and save a .pstats file for later analysis.
+
+        The stats file is written next to the metrics log, named after the
+        snippet and the time of the run.
+        """
+        import pstats
+
+        stats = pstats.Stats(profiler, stream=sys.stdout)
+        print("\n" + "-" * 60)
+        print(f"  PROFILE: top {limit} functions by cumulative time")
+        print("-" * 60)
+        stats.sort_stats('cumulative').print_stats(limit)
+
+        stats_file = self.metrics_log.parent / f"{snippet['name']}-{datetime.now():%Y%m%d-%H%M%S}.pstats"
+        try:
+            stats_file.parent.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(str(stats_file))
+            print(f"💾 Profile saved to {stats_file}")
+        except OSError as e:
+            print(f"⚠️  Can't save profile: {e}")
+
+    def log_metrics(self, snippet, args, ok, measurement):
+        """Append one JSON record to the metrics log; failures are ignored."""
+        record = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'snippet': snippet['name'],
+            'args': list(args),
+            'ok': ok,
+            'pid': os.getpid(),
+        }
+        record.update(measurement.as_record())
+
+        try:
+            self.metrics_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.metrics_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
 
     def show_menu(self):
         """Display the main menu with available snippets."""
@@ -60,21 +801,31 @@ class SnippetRunner:
         for i, snippet in enumerate(self.snippets, 1):
             print(f"  {i}. {snippet['title']}")
 
-        print(f"\n  0. Exit")
+        print(f"\n  r. Reload snippets")
+        print(f"  0. Exit")
         print("=" * 60)
         return True
 
     def get_choice(self):
-        """Get user's menu choice."""
+        """Get user's menu choice.
+
+        Returns the snippet index, 'reload' to force a rescan, or None to exit.
+        """
         while True:
             try:
                 choice = input("\nSelect a tool (number): ").strip()
+
+                if choice.lower() in ['r', 'reload']:
+                    return 'reload'
+
                 choice_num = int(choice)
 
                 if choice_num == 0:
                     return None
 
                 if 1 <= choice_num <= len(self.snippets):
+                    # Warm heavy imports while the user reads the usage guide
+                    prewarm_imports(self.snippets[choice_num - 1]['requires'])
                     return choice_num - 1
 
                 print(f"Please enter a number between 0 and {len(self.snippets)}")
@@ -106,11 +857,13 @@ class SnippetRunner:
                 # Parse command into arguments
                 args = command.split()
 
+                # "!profile <args>" runs the snippet under the profiler
+                profile = args[0].lower() == '!profile'
+                if profile:
+                    args = args[1:]
+
                 # Run the snippet
-                try:
-                    snippet['module'].run(args)
-                except Exception as e:
-                    print(f"\n❌ Error: {e}")
+                self.invoke(snippet, args, profile=profile)
 
                 # Ask what to do next
                 print("\n" + "-" * 60)
@@ -128,12 +881,222 @@ class SnippetRunner:
 
         return True
 
+    def run_once(self, name, args, profile=False):
+        """Run a single snippet non-interactively and return an exit code.
+
+        Only the named snippet is loaded. Exit codes: 0 on success, 1 if the
+        snippet failed, 2 if it could not be loaded.
+        """
+        snippet = self.find_snippet(name)
+        if snippet is None:
+            return 2
+
+        return 0 if self.invoke(snippet, args, profile=profile) else 1
+
+    def run_batch(self, manifest, workers=1):
+        """Run every job in a JSONL manifest.
+
+        With one worker, jobs run in this process: each snippet is loaded
+        once and reused by all jobs that name it, so heavy libraries are only
+        imported once. With more workers, jobs are dispatched to a process
+        pool (see run_batch_parallel). Returns 0 if every job succeeded, 1 if
+        any failed and 2 if the manifest can't be read.
+        """
+        try:
+            jobs = read_manifest(manifest)
+        except OSError as e:
+            print(f"❌ Error: Can't read manifest '{manifest}': {e}")
+            return 2
+
+        start = time.perf_counter()
+
+        if workers > 1:
+            results = self.run_batch_parallel(jobs, workers)
+        else:
+            loaded = {}
+            results = []
+            for number, job in enumerate(jobs, 1):
+                print("\n" + "-" * 60)
+                print(f"  [{number}/{len(jobs)}] {describe_job(job)}")
+                print("-" * 60)
+
+                job_start = time.perf_counter()
+                ok = self.run_job(job, loaded)
+                results.append((job, ok, time.perf_counter() - job_start))
+
+        print_batch_summary(results, time.perf_counter() - start)
+        return 0 if all(ok for _, ok, _ in results) else 1
+
+    def run_batch_parallel(self, jobs, workers):
+        """Run batch jobs on a process pool and return results in job order.
+
+        Each worker pre-imports the snippets named in the manifest. A job's
+        output is captured in the worker and printed as one block when it
+        finishes, so output from different jobs never interleaves.
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        names = sorted({job['snippet'] for job in jobs if not job['error']})
+        results = [None] * len(jobs)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                 initargs=(self.options(), names)) as pool:
+            futures = {pool.submit(run_batch_job, job): index for index, job in enumerate(jobs)}
+
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                job = jobs[index]
+                try:
+                    ok, seconds, output = future.result()
+                except Exception as e:
+                    ok, seconds, output = False, 0.0, f"❌ Error: Worker failed: {e}\n"
+
+                print("\n" + "-" * 60)
+                print(f"  [{done}/{len(jobs)}] {'✅' if ok else '❌'} {describe_job(job)} ({seconds:.2f}s)")
+                print("-" * 60)
+                print(output, end="")
+                sys.stdout.flush()
+
+                results[index] = (job, ok, seconds)
+
+        return results
+
+    def serve(self, socket_path, preload=()):
+        """Serve snippet invocations on a Unix socket with everything pre-imported.
+
+        All snippets, the modules they list in REQUIRES and the modules in
+        preload are imported once at startup.
+        Each request is handled in a forked child, which inherits the warm
+        modules, runs the snippet in the client's working directory and
+        streams its output back as JSON line frames.
+        """
+        if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'):
+            print("❌ Error: The snippet daemon needs Unix sockets and fork()")
+            return 2
+
+        # Requests run in the client's working directory
+        self.snippets_dir = self.snippets_dir.resolve()
+        self.metrics_log = self.metrics_log.resolve()
+        self.load_snippets()
+        self.warm_modules(preload)
+
+        if os.path.exists(socket_path):
+            if socket_in_use(socket_path):
+                print(f"❌ Error: A daemon is already listening on {socket_path}")
+                return 2
+            os.unlink(socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen()
+        print(f"🚀 Serving {len(self.snippets)} snippets on {socket_path} (Ctrl+C to stop)")
+
+        try:
+            while True:
+                conn, _ = server.accept()
+
+                # Pick up new or modified snippets so forked children stay warm
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.load_snippets()
+                    self.warm_modules()
+
+                if os.fork() == 0:
+                    # The child must never get back into this loop: its
+                    # finally would close and unlink the daemon's socket
+                    code = 1
+                    try:
+                        server.close()
+                        code = self.handle_request(conn)
+                    except BaseException:
+                        code = 1
+                    finally:
+                        os._exit(code)
+
+                conn.close()
+                # Reap finished children
+                try:
+                    while os.waitpid(-1, os.WNOHANG)[0]:
+                        pass
+                except ChildProcessError:
+                    pass
+        except KeyboardInterrupt:
+            print("\n👋 Daemon stopped")
+        finally:
+            server.close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+        return 0
+
+    def warm_modules(self, preload=()):
+        """Import all loaded snippets, their REQUIRES and the given modules."""
+        preload = list(preload)
+        for snippet in self.snippets:
+            try:
+                self.get_module(snippet)
+            except Exception as e:
+                print(f"Error loading {snippet['path'].name}: {e}")
+            preload.extend(name for name in snippet['requires'] if name not in sys.modules)
+
+        for name in dict.fromkeys(preload):
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"⚠️  Can't preload {name}: {e}")
+
+    def handle_request(self, conn):
+        """Run one daemon request in a forked child and return its exit status."""
+        try:
+            request = json.loads(conn.makefile('r', encoding='utf-8').readline())
+            os.chdir(request['cwd'])
+
+            sys.stdin = open(os.devnull, 'r')
+            sys.stdout = SocketStream(conn, 'out')
+            sys.stderr = SocketStream(conn, 'err')
+
+            snippets = {snippet['name']: snippet for snippet in self.snippets}
+            snippet = snippets.get(request['snippet']) or self.find_snippet(request['snippet'])
+            if snippet is None:
+                exit_code = 2
+            else:
+                try:
+                    exit_code = 0 if self.invoke(snippet, request['args']) else 1
+                except SystemExit as e:
+                    # sys.exit() in a snippet ends the request, not the daemon
+                    exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except KeyboardInterrupt:
+                    exit_code = 130
+
+            conn.sendall((json.dumps({'exit': exit_code}) + "\n").encode('utf-8'))
+            return 0
+        except Exception:
+            return 1
+        finally:
+            conn.close()
+
+    def run_job(self, job, loaded):
+        """Run a single batch job, loading its snippet into loaded if needed."""
+        if job['error']:
+            print(f"❌ Error: {job['error']}")
+            return False
+
+        if job['snippet'] not in loaded:
+            loaded[job['snippet']] = self.find_snippet(job['snippet'])
+        snippet = loaded[job['snippet']]
+        if snippet is None:
+            return False
+
+        return self.invoke(snippet, job['args'])
+
     def run(self):
         """Main application loop."""
         print("\nWelcome to Snippet Runner!")
 
+        force_reload = False
+
         while True:
-            self.load_snippets()
+            self.load_snippets(force=force_reload)
+            force_reload = False
 
             if not self.show_menu():
                 print("\nAdd snippet files to the 'snippets' directory and restart.")
@@ -145,15 +1108,97 @@ class SnippetRunner:
                 print("\nGoodbye!")
                 break
 
+            if choice == 'reload':
+                print("\n🔄 Reloading snippets...")
+                force_reload = True
+                continue
+
             if not self.run_snippet(choice):
                 print("\nGoodbye!")
                 break
 
 
-def main():
-    runner = SnippetRunner()
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Manage and execute Python snippets. "
+                    "Without a command, starts the interactive menu.")
+    parser.add_argument('--snippets-dir', default="snippets",
+                        help="directory containing the snippets (default: snippets)")
+    parser.add_argument('--no-metrics', action='store_true',
+                        help="don't print or log timing and memory metrics per run")
+    parser.add_argument('--metrics-log', metavar='PATH',
+                        help="JSONL file for per-run metrics (default: <snippets-dir>/data/metrics.jsonl)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="also record the tracemalloc peak of each run (slower)")
+    commands = parser.add_subparsers(dest='command')
+
+    run_parser = commands.add_parser('run', help="run a single snippet and exit")
+    run_parser.add_argument('--profile', action='store_true',
+                            help="profile the run with cProfile and save a .pstats file")
+    run_parser.add_argument('snippet', help="snippet file name, e.g. csv_to_excel")
+    run_parser.add_argument('args', nargs=argparse.REMAINDER,
+                            help="arguments passed to the snippet's run()")
+
+    batch_parser = commands.add_parser('batch', help="run all jobs from a JSONL manifest")
+    batch_parser.add_argument('manifest',
+                              help='JSONL file with one {"snippet": ..., "args": [...]} per line')
+    batch_parser.add_argument('-j', '--workers', type=int, default=1,
+                              help="run jobs on a pool of this many processes (default: 1, in-process)")
+
+    serve_parser = commands.add_parser('serve', help="keep snippets imported and serve 'client' requests")
+    serve_parser.add_argument('--socket', default=default_socket_path(),
+                              help="Unix socket path (default: %(default)s)")
+    serve_parser.add_argument('--preload', action='append', default=[], metavar='MODULE',
+                              help="extra module to import at startup, e.g. pandas (repeatable)")
+
+    client_parser = commands.add_parser('client', help="run a snippet through the 'serve' daemon")
+    client_parser.add_argument('--socket', default=default_socket_path(),
+                               help="Unix socket path (default: %(default)s)")
+    client_parser.add_argument('snippet', help="snippet file name, e.g. csv_to_excel")
+    client_parser.add_argument('args', nargs=argparse.REMAINDER,
+                               help="arguments passed to the snippet's run()")
+
+    options = parser.parse_args(argv)
+    runner = SnippetRunner(options.snippets_dir, metrics=not options.no_metrics,
+                           metrics_log=options.metrics_log, trace_memory=options.trace_memory)
+
+    if options.command == 'run':
+        try:
+            return runner.run_once(options.snippet, options.args, options.profile)
+        except KeyboardInterrupt:
+            print("\n")
+            return 130
+
+    if options.command == 'batch':
+        if options.workers < 1:
+            parser.error("--workers must be at least 1")
+        try:
+            return runner.run_batch(options.manifest, options.workers)
+        except KeyboardInterrupt:
+            print("\n")
+            return 130
+
+    if options.command == 'serve':
+        return runner.serve(options.socket, options.preload)
+
+    if options.command == 'client':
+        try:
+            exit_code = None
+            # The daemon can't read this process's stdin, so '-' arguments run here
+            if '-' not in options.args:
+                exit_code = run_client(options.socket, options.snippet, options.args)
+                if exit_code is None:
+                    print(f"⚠️  No daemon on {options.socket}, running in-process", file=sys.stderr)
+            if exit_code is None:
+                exit_code = runner.run_once(options.snippet, options.args)
+            return exit_code
+        except KeyboardInterrupt:
+            print("\n")
+            return 130
+
     runner.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
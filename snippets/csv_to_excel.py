@@ -3,112 +3,1804 @@ CSV to Excel Converter
 Converts tab-delimited CSV files to Excel format.
 """
 
+import bz2
+import codecs
+import contextlib
+import csv
+import glob
+import gzip
+import hashlib
+import importlib.util
+import io
+import itertools
+import json
+import lzma
+import mmap
+import os
+import re
+import sys
+import time
+import zipfile
+
 TITLE = "CSV to Excel Converter"
 
 DESCRIPTION = """Convert a CSV file to Excel format with custom delimiter.
 
 Usage:
-  <input> <output> [delimiter]
+  <input> <output> [delimiter] [output_delimiter]
 
 Input/Output Options:
   - filename.csv    : Read from/write to file
   - clipboard/clip  : Read from/write to clipboard
+  - -               : Read from stdin/write delimited text to stdout (messages
+                      then go to stderr), for shell pipelines
+  - a directory or a glob like "exports/*.csv" as input, with an output
+    directory: convert every file in parallel
+  - compressed files (.gz, .bz2, .xz, .zst) are decompressed while reading,
+    also when recognized by content; .csv.gz etc. outputs are compressed
+    while writing (.zst needs: pip install zstandard)
 
 Delimiter (optional):
   - tab (default)
+  - auto (detect delimiter, quoting, header row and encoding)
   - comma or ,
   - semicolon or ;
   - pipe or |
   - Any single character
 
+Output delimiter (optional, for clipboard and .csv/.tsv/.txt output):
+  same values, default tab. Delimited output is transcoded record by record
+  without loading the file into memory.
+
+Options:
+  --stream          : Read and write in chunks (for files larger than memory)
+  --chunksize=N     : Rows per chunk when streaming (default 50000)
+  --writer=xml      : Fast streaming writer that emits the XLSX XML directly
+                      (default: openpyxl write-only mode)
+  --split=files     : Beyond Excel's 1,048,576 rows per sheet, continue in
+                      new files (out_2.xlsx, ...) instead of new sheets
+  --max-rows=N      : Rows per sheet including the header (default: Excel's limit)
+  --quoting=all     : Quoting for delimited output: minimal (default), all
+                      or none
+  --engine=pyarrow  : CSV parser for Excel output: c (default), python,
+                      pyarrow (multithreaded, needs pyarrow) or auto
+  --strings         : Keep every value as text (skips type inference)
+  --dtype=T         : Column types, e.g. str or id:int64,amount:float64
+  --usecols=a,b     : Only read these columns (names or 0-based numbers)
+  --encoding=E      : Input file encoding (default utf-8, detected with auto)
+  --mmap            : Read the input file through a memory map instead of
+                      buffered reads
+  --ranges=N        : Excel output: split the memory-mapped file at line
+                      breaks into N ranges and parse them in parallel
+                      (not for files with line breaks inside quoted fields)
+  --workers=N       : Parallel conversions for directory/glob input
+                      (default: number of CPUs)
+  --ext=csv         : Output format for directory/glob input: xlsx (default),
+                      csv, tsv or txt
+  --combine         : Write several inputs (a directory, a glob or a
+                      comma-separated list) into one workbook, one sheet each
+                      (not with --split, --mmap, --ranges or --quoting)
+  --force           : Convert even if the output is up to date (file to file
+                      conversions are skipped when neither the input, the
+                      options nor the output changed since the last run)
+
 Examples:
   data.csv output.xlsx          # Tab-delimited file to Excel
   data.csv output.xlsx comma    # Comma-delimited file to Excel
+  data.csv output.xlsx auto     # Detect the delimiter and encoding
   clipboard output.xlsx         # Clipboard to Excel file
   data.csv clipboard tab        # File to clipboard
+  data.csv clipboard tab comma  # File to clipboard as comma-delimited
+  data.csv output.csv comma tab # Comma-delimited file to tab-delimited file
   clipboard clipboard comma     # Clipboard to clipboard (reformats)
+  big.csv big.xlsx comma --stream   # Stream a large file with bounded memory
+  data.csv.gz output.xlsx comma     # Read a compressed export directly
+  data.csv out.tsv.zst comma tab    # Write compressed delimited text
+  - - comma tab                     # stdin to stdout, comma to tab
+  - report.xlsx auto                # Excel from piped input
+  "exports/*.csv" out/ comma        # Every matching file to out/<name>.xlsx
+  "exports/*.csv" all.xlsx comma --combine   # One workbook, a sheet per file
+
+Storage: Conversion cache in snippets/data/csv_to_excel_cache/
 
 Required packages: pandas, openpyxl, pyperclip
 Install with: pip install pandas openpyxl pyperclip
 """
 
+REQUIRES = ['pandas', 'openpyxl', 'pyperclip']
+
+
+CLIPBOARD_NAMES = ['clipboard', 'clip', 'cb']
+
+# Input/output name for stdin/stdout
+STDIO = '-'
+
+# Map delimiter names to actual characters
+DELIMITERS = {
+    'tab': '\t',
+    'comma': ',',
+    ',': ',',
+    'semicolon': ';',
+    ';': ';',
+    'pipe': '|',
+    '|': '|',
+    'space': ' ',
+}
+
+# Outputs with these extensions are written as delimited text, not Excel
+TEXT_EXTENSIONS = ('.csv', '.tsv', '.txt')
+
+# --name[=value] options run() understands
+OPTIONS = ('stream', 'chunksize', 'writer', 'split', 'max-rows', 'quoting', 'engine',
+           'strings', 'dtype', 'usecols', 'encoding', 'mmap', 'ranges', 'workers', 'ext',
+           'combine', 'force')
+
+# Options that don't apply to --combine, which writes one Excel workbook
+COMBINE_UNSUPPORTED = ('split', 'mmap', 'ranges', 'quoting', 'ext', 'workers', 'force')
+
+# --quoting values for delimited text output. Transcoded fields are never
+# parsed as numbers, so csv.QUOTE_NONNUMERIC would quote everything like 'all'.
+QUOTING = {
+    'minimal': csv.QUOTE_MINIMAL,
+    'all': csv.QUOTE_ALL,
+    'none': csv.QUOTE_NONE,
+}
+
+# Records per batch when transcoding CSV to CSV
+TRANSCODE_BATCH = 10_000
+
+# --engine values; 'auto' means pyarrow when installed, else the C engine
+ENGINES = ('auto', 'c', 'python', 'pyarrow')
+
+# Bytes per record batch when streaming with pyarrow
+PYARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Rows per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 50_000
+
+# Compressed files by extension and by their leading magic bytes
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+COMPRESSION_MAGIC = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+}
+
+# Openers for the stdlib compression formats (zstd needs zstandard)
+COMPRESSION_OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+# gzip level for compressed output; 9 is much slower for little gain
+GZIP_LEVEL = 6
+
+# Input files picked up from a directory, plain or compressed
+INPUT_EXTENSIONS = TEXT_EXTENSIONS + tuple(
+    ext + compressed for ext in TEXT_EXTENSIONS for compressed in COMPRESSION_EXTENSIONS)
+
+# Output formats for directory/glob input
+BATCH_FORMATS = ('xlsx',) + tuple(ext.lstrip('.') for ext in TEXT_EXTENSIONS)
+
+# One small JSON file per output, remembering the conversion that produced it
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'csv_to_excel_cache')
+
+# Options that don't change the output, left out of the cache key
+UNCACHED_OPTIONS = ('force', 'workers')
+
+# Bytes read at a time when hashing an input
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Rows per worksheet in Excel, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+# Worksheet names: at most 31 characters, none of []:*?/\
+SHEET_TITLE_LENGTH = 31
+INVALID_SHEET_CHARACTERS = re.compile(r'[\[\]:*?/\\]')
+
+# Bytes read from the start of the input to detect its format
+SNIFF_BYTES = 64 * 1024
+
+# Delimiters considered by auto detection
+SNIFF_DELIMITERS = ',\t;|'
+
+# Bytes decoded at a time when transcoding a memory-mapped file
+MMAP_BLOCK_SIZE = 1024 * 1024
+
+# Encodings where a b'\n' byte isn't always a line break
+WIDE_ENCODINGS = ('utf-16', 'utf-32')
+
+# Byte order marks and the encodings they imply
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def delimiter_name(delimiter):
+    """Readable name of a delimiter character for messages."""
+    for name, value in DELIMITERS.items():
+        if value == delimiter and name.isalpha():
+            return name
+    return f"'{delimiter}'"
+
+
+def detect_encoding(sample):
+    """Guess the encoding of a byte sample: BOM, then UTF-8, then cp1252/latin-1.
+
+    The sample may end in the middle of a character, so UTF-8 is checked with
+    an incremental decoder that doesn't treat a truncated tail as an error.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        # latin-1 decodes any byte sequence
+        return 'latin-1'
+
+
+def sniff_csv(sample):
+    """Detect delimiter, quoting, header row and encoding from a sample.
+
+    `sample` is the first SNIFF_BYTES of the input, as bytes for files or as
+    text for the clipboard (then no encoding is detected). Only complete
+    lines are inspected. Returns a dict with delimiter, quotechar,
+    skipinitialspace, has_header and encoding.
+    """
+    truncated = len(sample) >= SNIFF_BYTES
+    encoding = None
+    if isinstance(sample, bytes):
+        encoding = detect_encoding(sample)
+        sample = sample.decode(encoding, errors='ignore')
+
+    # Drop the last, possibly truncated, line
+    if truncated and '\n' in sample:
+        sample = sample[:sample.rindex('\n') + 1]
+
+    sniffer = csv.Sniffer()
+    try:
+        dialect = sniffer.sniff(sample, delimiters=SNIFF_DELIMITERS)
+        delimiter = dialect.delimiter
+        quotechar = dialect.quotechar
+        skipinitialspace = dialect.skipinitialspace
+    except csv.Error:
+        # No consistent pattern (e.g. a single column): go by the first line
+        first_line = sample.split('\n', 1)[0]
+        counts = {candidate: first_line.count(candidate) for candidate in SNIFF_DELIMITERS}
+        delimiter = max(counts, key=counts.get) if max(counts.values()) else '\t'
+        quotechar = '"'
+        skipinitialspace = False
+
+    try:
+        has_header = sniffer.has_header(sample)
+    except csv.Error:
+        has_header = True
+
+    return {
+        'delimiter': delimiter,
+        'quotechar': quotechar,
+        'skipinitialspace': skipinitialspace,
+        'has_header': has_header,
+        'encoding': encoding,
+    }
+
+
+def read_sample(input_source):
+    """First SNIFF_BYTES of a file (decompressed), for sniff_csv()."""
+    with open_input(input_source) as f:
+        return f.read(SNIFF_BYTES)
+
+
+def compression_of(path):
+    """Compression of a file by its extension, or None."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def strip_compression(path):
+    """Path without its compression extension (data.csv.gz -> data.csv)."""
+    root, ext = os.path.splitext(path)
+    return root if ext.lower() in COMPRESSION_EXTENSIONS else path
+
+
+def detect_compression(path):
+    """Compression of an input file by extension, else by its magic bytes."""
+    compression = compression_of(path)
+    if compression:
+        return compression
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def same_file(path, other):
+    """Whether two paths name the same file; `other` may not exist yet."""
+    try:
+        return os.path.samefile(path, other)
+    except OSError:
+        return os.path.realpath(path) == os.path.realpath(other)
+
+
+def zstandard_module():
+    """The optional zstandard package; raises ValueError when it's missing."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(".zst files need zstandard (pip install zstandard)")
+    return zstandard
+
+
+class StdinReader(io.RawIOBase):
+    """Raw stream over stdin's buffer that leaves stdin open when closed.
+
+    The wrappers around it (buffering, decompression, decoding) close it
+    when they are closed or collected; stdin itself must stay usable for
+    the runner's next prompt.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read1(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_stdin():
+    """stdin as a binary stream that can peek() ahead, decompressed if needed.
+
+    Compression is recognized by magic bytes. The stream buffers SNIFF_BYTES
+    so the auto delimiter can inspect a sample without consuming it.
+    """
+    stdin = getattr(sys.stdin, 'buffer', None)
+    if stdin is None:
+        # stdin was replaced by a text stream
+        stdin = io.BytesIO(sys.stdin.read().encode('utf-8'))
+    raw = io.BufferedReader(StdinReader(stdin), buffer_size=SNIFF_BYTES)
+
+    head = raw.peek(6)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            if compression == 'zstd':
+                decompressed = zstandard_module().ZstdDecompressor().stream_reader(raw)
+            else:
+                decompressed = COMPRESSION_OPENERS[compression](raw, 'rb')
+            return io.BufferedReader(decompressed, buffer_size=SNIFF_BYTES)
+    return raw
+
+
+def open_input(path, encoding=None):
+    """Open an input file (or stdin for '-'), decompressing it on the fly.
+
+    Returns a binary stream, or a text stream (newline='', as the csv module
+    wants) when an encoding is given. Nothing is decompressed to disk.
+    """
+    compression = None if path == STDIO else detect_compression(path)
+    if path == STDIO:
+        raw = open_stdin()
+    elif compression is None:
+        raw = open(path, 'rb')
+    elif compression == 'zstd':
+        raw = zstandard_module().ZstdDecompressor().stream_reader(open(path, 'rb'))
+    else:
+        raw = COMPRESSION_OPENERS[compression](path, 'rb')
+
+    if encoding is None:
+        return raw
+    return io.TextIOWrapper(raw, encoding=encoding, newline='')
+
+
+def discard_output(stream):
+    """Point a closed pipe's descriptor at devnull so flushing at exit doesn't fail."""
+    try:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+
+
+def open_output(path, encoding='utf-8'):
+    """Open a text output file, compressing by extension (.gz, .bz2, .xz, .zst)."""
+    compression = compression_of(path)
+    if compression is None:
+        return open(path, 'w', newline='', encoding=encoding)
+
+    if compression == 'zstd':
+        raw = zstandard_module().ZstdCompressor().stream_writer(open(path, 'wb'))
+    elif compression == 'gzip':
+        raw = gzip.open(path, 'wb', compresslevel=GZIP_LEVEL)
+    else:
+        raw = COMPRESSION_OPENERS[compression](path, 'wb')
+    return io.TextIOWrapper(raw, encoding=encoding, newline='')
+
+
+def dialect_options(detected):
+    """read_csv arguments for a sniff_csv() result that differ from the defaults."""
+    read_options = {}
+    if detected['encoding']:
+        read_options['encoding'] = detected['encoding']
+    if detected['quotechar'] != '"':
+        read_options['quotechar'] = detected['quotechar']
+    if detected['skipinitialspace']:
+        read_options['skipinitialspace'] = True
+    if not detected['has_header']:
+        read_options['header'] = None
+    return read_options
+
+
+def describe_detected(detected):
+    """One-line summary of a sniff_csv() result."""
+    parts = [f"{delimiter_name(detected['delimiter'])} delimiter"]
+    if detected['encoding']:
+        parts.append(detected['encoding'])
+    if detected['quotechar'] != '"':
+        parts.append(f"{detected['quotechar']} quotes")
+    parts.append("header row" if detected['has_header'] else "no header row")
+    return ', '.join(parts)
+
+
+def apply_sniffed(sample, read_options):
+    """Sniff a sample and merge the result into a copy of read_options.
+
+    An explicit --encoding wins over the guessed one. pyarrow can't skip
+    spaces after delimiters, so such input falls back to the C engine.
+    Prints what was detected and returns (delimiter, read_options).
+    """
+    detected = sniff_csv(sample)
+    if 'encoding' in read_options:
+        detected['encoding'] = read_options['encoding']
+    print(f"🔎 Detected {describe_detected(detected)}")
+
+    read_options = dict(dialect_options(detected), **read_options)
+    if read_options.get('skipinitialspace') and read_options['engine'] == 'pyarrow':
+        print("⚠️  pyarrow can't skip spaces after delimiters, using the C engine")
+        read_options['engine'] = 'c'
+    return detected['delimiter'], read_options
+
+
+def parse_errors():
+    """Exceptions for malformed CSV; pandas' ParserError only once pandas is loaded."""
+    pandas = sys.modules.get('pandas')
+    if pandas is None:
+        return (csv.Error,)
+    return (csv.Error, pandas.errors.ParserError)
+
+
+def split_options(args):
+    """Split args into positional arguments and --name[=value] options.
+
+    Raises ValueError for an option not in OPTIONS, so a typo doesn't
+    silently fall back to the default behavior.
+    """
+    import difflib
+
+    positional = []
+    options = {}
+    for arg in args:
+        if arg.startswith('--') and len(arg) > 2:
+            name, _, value = arg[2:].partition('=')
+            name = name.lower()
+            if name not in OPTIONS:
+                close = difflib.get_close_matches(name, OPTIONS, n=1)
+                hint = f" (did you mean --{close[0]}?)" if close else ""
+                raise ValueError(f"Unknown option --{name}{hint}")
+            options[name] = value if value else True
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+def int_option(options, name, default, minimum, maximum=None):
+    """Integer value of --name, checked against a range; raises ValueError."""
+    if options.get(name) is True:
+        raise ValueError(f"--{name} needs a number, e.g. --{name}=N")
+    try:
+        value = int(options.get(name, default))
+    except (TypeError, ValueError):
+        value = None
+    if value is None or value < minimum or (maximum is not None and value > maximum):
+        if maximum is None:
+            raise ValueError(f"--{name} must be a number of at least {minimum}, "
+                             f"got '{options.get(name)}'")
+        raise ValueError(f"--{name} must be between {minimum:,} and {maximum:,}")
+    return value
+
+
+def chunk_rows(chunk):
+    """Rows of a DataFrame chunk as tuples, with missing values as None."""
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def column_letter(index):
+    """Excel column name for a zero-based column index (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class OpenpyxlStreamWriter:
+    """Sheet-by-sheet workbook writer on top of openpyxl's write-only mode."""
+
+    def __init__(self, output_dest):
+        from openpyxl import Workbook
+
+        self.output_dest = output_dest
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+
+    def add_sheet(self, title):
+        self.sheet = self.workbook.create_sheet(title)
+
+    def append(self, row):
+        self.sheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.output_dest)
+
+
+class XlsxStreamWriter:
+    """Minimal XLSX writer that serializes rows straight into the zip file.
+
+    Each worksheet's XML is written to its zip entry as rows arrive, using
+    inline strings so no shared string table has to be kept in memory. Only
+    values are written (no styles), which is all a CSV conversion needs.
+    """
+
+    NAMESPACE = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    REL_NAMESPACE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    PACKAGE_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+    # Rows buffered before each write to the zip stream
+    BUFFER_ROWS = 1000
+    # Fast deflate: the XML compresses well even at low levels
+    COMPRESSLEVEL = 1
+
+    # Characters that are not allowed in XML 1.0
+    ILLEGAL_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+    def __init__(self, output_dest):
+        self.zip = zipfile.ZipFile(output_dest, 'w', compression=zipfile.ZIP_DEFLATED,
+                                   compresslevel=self.COMPRESSLEVEL)
+        self.sheets = []
+        self.stream = None
+        self.buffer = []
+        self.row_number = 0
+        self.columns = []
+
+    def add_sheet(self, title):
+        self._finish_sheet()
+        self.sheets.append(title)
+        # A full sheet of a wide export can pass 2 GiB of XML, which needs ZIP64;
+        # the size isn't known up front, so always allow it
+        self.stream = self.zip.open(f'xl/worksheets/sheet{len(self.sheets)}.xml', 'w',
+                                    force_zip64=True)
+        self.stream.write(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{self.NAMESPACE}"><sheetData>'.encode('utf-8'))
+        self.row_number = 0
+
+    def append(self, row):
+        self.row_number += 1
+        number = self.row_number
+        if len(row) > len(self.columns):
+            self.columns = [column_letter(i) for i in range(len(row))]
+
+        cells = []
+        for letter, value in zip(self.columns, row):
+            if value is None:
+                continue
+            if value is True or value is False:
+                cells.append(f'<c r="{letter}{number}" t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, (int, float)):
+                if value != value or value in (float('inf'), float('-inf')):
+                    continue
+                cells.append(f'<c r="{letter}{number}"><v>{value!r}</v></c>')
+            else:
+                cells.append(f'<c r="{letter}{number}" t="inlineStr">{self._inline_string(value)}</c>')
+
+        self.buffer.append(f'<row r="{number}">{"".join(cells)}</row>')
+        if len(self.buffer) >= self.BUFFER_ROWS:
+            self._flush()
+
+    def close(self):
+        self._finish_sheet()
+        self._write_package()
+        self.zip.close()
+
+    def _inline_string(self, value):
+        text = self.ILLEGAL_CHARACTERS.sub('', str(value))
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        if text != text.strip():
+            return f'<is><t xml:space="preserve">{text}</t></is>'
+        return f'<is><t>{text}</t></is>'
+
+    def _flush(self):
+        self.stream.write(''.join(self.buffer).encode('utf-8'))
+        self.buffer = []
+
+    def _finish_sheet(self):
+        if self.stream is None:
+            return
+        self._flush()
+        self.stream.write(b'</sheetData></worksheet>')
+        self.stream.close()
+        self.stream = None
+
+    def _write_package(self):
+        """Write the workbook, relationship, style and content type parts."""
+        header = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        count = len(self.sheets)
+
+        sheet_types = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, count + 1))
+        self.zip.writestr('[Content_Types].xml', header + (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{sheet_types}</Types>'))
+
+        self.zip.writestr('_rels/.rels', header + (
+            f'<Relationships xmlns="{self.PACKAGE_RELS}">'
+            f'<Relationship Id="rId1" Type="{self.REL_NAMESPACE}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+
+        sheets = ''.join(
+            f'<sheet name="{self._escape_attribute(title)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, title in enumerate(self.sheets, 1))
+        self.zip.writestr('xl/workbook.xml', header + (
+            f'<workbook xmlns="{self.NAMESPACE}" xmlns:r="{self.REL_NAMESPACE}">'
+            f'<sheets>{sheets}</sheets></workbook>'))
+
+        rels = ''.join(
+            f'<Relationship Id="rId{i}" Type="{self.REL_NAMESPACE}/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, count + 1))
+        self.zip.writestr('xl/_rels/workbook.xml.rels', header + (
+            f'<Relationships xmlns="{self.PACKAGE_RELS}">{rels}'
+            f'<Relationship Id="rId{count + 1}" Type="{self.REL_NAMESPACE}/styles" Target="styles.xml"/>'
+            '</Relationships>'))
+
+        self.zip.writestr('xl/styles.xml', header + (
+            f'<styleSheet xmlns="{self.NAMESPACE}">'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'))
+
+    @staticmethod
+    def _escape_attribute(value):
+        return (value.replace('&', '&amp;').replace('<', '&lt;')
+                .replace('>', '&gt;').replace('"', '&quot;'))
+
+
+WRITERS = {
+    'openpyxl': OpenpyxlStreamWriter,
+    'xml': XlsxStreamWriter,
+}
+
+
+class SplitFilesWriter:
+    """Stream writer that puts every sheet in a workbook of its own.
+
+    The first sheet goes to output_dest, the next ones to out_2.xlsx,
+    out_3.xlsx, ... (see numbered_path).
+    """
+
+    def __init__(self, writer, output_dest):
+        self.writer = writer
+        self.output_dest = output_dest
+        self.files = 0
+        self.workbook = None
+
+    def add_sheet(self, title):
+        if self.workbook is not None:
+            self.workbook.close()
+        self.files += 1
+        path = self.output_dest if self.files == 1 else numbered_path(self.output_dest, self.files)
+        self.workbook = WRITERS[self.writer](path)
+        self.workbook.add_sheet(title)
+
+    def append(self, row):
+        self.workbook.append(row)
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.close()
+
+
+def parse_read_options(options):
+    """Translate --engine, --dtype, --usecols, --strings and --encoding into read_csv arguments.
+
+    'auto' uses the multithreaded pyarrow engine when it is installed; asking
+    for pyarrow without it, or with column numbers in --usecols, falls back to
+    the C engine with a warning. Raises ValueError for invalid values.
+    """
+    engine = str(options.get('engine', 'c')).lower()
+    if engine not in ENGINES:
+        raise ValueError(f"--engine must be one of {', '.join(ENGINES)}, got '{engine}'")
+
+    if engine in ('auto', 'pyarrow'):
+        if importlib.util.find_spec('pyarrow') is not None:
+            engine = 'pyarrow'
+        else:
+            if engine == 'pyarrow':
+                print("⚠️  pyarrow is not installed, using the C engine (pip install pyarrow)")
+            engine = 'c'
+
+    read_options = {'engine': engine}
+
+    if 'encoding' in options:
+        if options['encoding'] is True:
+            raise ValueError("--encoding needs a value, e.g. --encoding=cp1252")
+        codecs.lookup(options['encoding'])  # raises LookupError for unknown encodings
+        read_options['encoding'] = options['encoding']
+
+    if 'strings' in options:
+        # Keep every value as text: no type inference, only empty cells are missing
+        read_options['dtype'] = str
+        read_options['keep_default_na'] = False
+        read_options['na_values'] = ['']
+    elif 'dtype' in options:
+        read_options['dtype'] = parse_dtype(options['dtype'])
+
+    if 'usecols' in options:
+        if options['usecols'] is True:
+            raise ValueError("--usecols needs a list of columns, e.g. --usecols=id,name")
+        columns = [column for column in options['usecols'].split(',') if column]
+        read_options['usecols'] = [int(c) if c.isdigit() else c for c in columns]
+        if engine == 'pyarrow' and any(isinstance(c, int) for c in read_options['usecols']):
+            print("⚠️  pyarrow only selects columns by name, using the C engine for --usecols numbers")
+            read_options['engine'] = 'c'
+
+    return read_options
+
+
+def parse_dtype(value):
+    """Parse --dtype=str or --dtype=col:type,col:type into a read_csv dtype."""
+    if value is True:
+        raise ValueError("--dtype needs a value, e.g. --dtype=str or --dtype=id:int64,name:str")
+    if ':' not in value:
+        return value
+
+    dtype = {}
+    for pair in value.split(','):
+        column, _, column_type = pair.partition(':')
+        if not column or not column_type:
+            raise ValueError(f"Invalid --dtype entry '{pair}', expected column:type")
+        dtype[column] = column_type
+    return dtype
+
+
+def read_chunks(reader_input, delimiter, chunksize, read_options):
+    """Iterate over the CSV input as DataFrame chunks.
+
+    pandas can't read in chunks with the pyarrow engine, so pyarrow's own
+    streaming reader is used instead; with dtype hints it falls back to the
+    C engine.
+    """
+    import pandas as pd
+
+    if read_options['engine'] != 'pyarrow':
+        return pd.read_csv(reader_input, sep=delimiter, chunksize=chunksize, **read_options)
+
+    if 'dtype' in read_options:
+        print("⚠️  --dtype/--strings aren't supported when streaming with pyarrow, using the C engine")
+        return pd.read_csv(reader_input, sep=delimiter, chunksize=chunksize,
+                           **dict(read_options, engine='c'))
+
+    return pyarrow_chunks(reader_input, delimiter, read_options)
+
+
+def pyarrow_chunks(reader_input, delimiter, read_options):
+    """Stream record batches with pyarrow's multithreaded CSV reader."""
+    from io import BytesIO, StringIO
+    from pyarrow import csv as pa_csv
+
+    encoding = read_options.get('encoding', 'utf-8')
+    if isinstance(reader_input, StringIO):
+        reader_input = BytesIO(reader_input.getvalue().encode('utf-8'))
+        encoding = 'utf-8'
+
+    usecols = read_options.get('usecols')
+    convert_options = pa_csv.ConvertOptions(include_columns=usecols) if usecols else None
+    reader = pa_csv.open_csv(
+        reader_input,
+        read_options=pa_csv.ReadOptions(
+            block_size=PYARROW_BLOCK_SIZE, encoding=encoding,
+            autogenerate_column_names=read_options.get('header', 'infer') is None),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter,
+                                          quote_char=read_options.get('quotechar', '"')),
+        convert_options=convert_options)
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def open_mapped(input_source):
+    """Memory-map a file read-only."""
+    with open(input_source, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"'{input_source}' is empty")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def is_wide_encoding(encoding):
+    """Whether lines can't be found by looking for b'\\n' in this encoding."""
+    return codecs.lookup(encoding).name.startswith(WIDE_ENCODINGS)
+
+
+def mapped_input(input_source, read_options):
+    """Input and read_csv arguments for parsing a file through a memory map.
+
+    The C and python engines map the file themselves with memory_map=True;
+    pyarrow doesn't support that option but reads from its own memory map.
+    """
+    if read_options['engine'] == 'pyarrow':
+        import pyarrow as pa
+        return pa.memory_map(input_source), read_options
+    return input_source, dict(read_options, memory_map=True)
+
+
+def mapped_lines(mapped, encoding):
+    """Decoded lines of a memory-mapped file, for csv.reader.
+
+    The map is decoded in line-aligned blocks of MMAP_BLOCK_SIZE bytes, so
+    there's one decode call per block rather than per line.
+    """
+    from io import StringIO
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for begin, end in line_ranges(mapped, -(-len(mapped) // MMAP_BLOCK_SIZE)):
+        yield from StringIO(decoder.decode(mapped[begin:end]), newline='')
+
+
+def line_ranges(mapped, count, start=0):
+    """Split mapped[start:] into at most `count` (begin, end) byte ranges.
+
+    Every range but the last ends just after a newline, so no record is cut
+    in two (unless a quoted field contains a line break).
+    """
+    size = len(mapped)
+    step = max(-(-(size - start) // count), 1)
+    ranges = []
+    begin = start
+    while begin < size:
+        end = mapped.find(b'\n', min(begin + step, size) - 1)
+        end = size if end == -1 else end + 1
+        ranges.append((begin, end))
+        begin = end
+    return ranges
+
+
+def range_chunks(input_source, delimiter, count, read_options):
+    """Parse a memory-mapped file as `count` line-aligned ranges in parallel.
+
+    The header line is read once and its names passed to every range, which
+    is then parsed by read_csv on its own thread. Yields one DataFrame per
+    range, in file order. A range with an odd number of quote characters
+    means a quoted field spans a boundary, which raises ValueError.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from io import BytesIO
+    import pandas as pd
+
+    encoding = read_options.get('encoding', 'utf-8')
+    if is_wide_encoding(encoding):
+        raise ValueError(f"--ranges can't split {encoding} input, run without it")
+    quotechar = read_options.get('quotechar', '"')
+
+    with open_mapped(input_source) as mapped:
+        start = 0
+        names = None
+        if read_options.get('header', 'infer') is not None:
+            start = mapped.find(b'\n') + 1 or len(mapped)
+            header_line = mapped[:start].decode(encoding)
+            names = next(csv.reader([header_line], delimiter=delimiter, quotechar=quotechar,
+                                    skipinitialspace=read_options.get('skipinitialspace', False)))
+        range_options = dict(read_options, header=None, names=names)
+        quote = quotechar.encode(encoding)
+
+        def parse(bounds):
+            data = mapped[bounds[0]:bounds[1]]
+            if data.count(quote) % 2:
+                raise ValueError("A quoted field contains a line break, run without --ranges")
+            return pd.read_csv(BytesIO(data), sep=delimiter, **range_options)
+
+        ranges = line_ranges(mapped, count, start)
+        if not ranges:
+            yield pd.DataFrame(columns=names)
+            return
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for chunk in executor.map(parse, ranges):
+                yield chunk
+
+
+def is_text_output(output_dest):
+    """Whether the output should be written as delimited text."""
+    if output_dest == STDIO or output_dest.lower() in CLIPBOARD_NAMES:
+        return True
+    return strip_compression(output_dest).lower().endswith(TEXT_EXTENSIONS)
+
+
+def transcode_csv(source, output, delimiter, output_delimiter, quoting=csv.QUOTE_MINIMAL,
+                  quotechar='"', skipinitialspace=False):
+    """Copy CSV records from one text stream to another with a new delimiter.
+
+    Records are parsed and written in batches by the csv module, so memory
+    stays constant no matter how large the input is. Returns the number of
+    records written (header included).
+    """
+    reader = csv.reader(source, delimiter=delimiter, quotechar=quotechar,
+                        skipinitialspace=skipinitialspace)
+    writer = csv.writer(output, delimiter=output_delimiter, quoting=quoting,
+                        escapechar='\\' if quoting == csv.QUOTE_NONE else None,
+                        lineterminator='\n')
+
+    records = 0
+    while True:
+        batch = list(itertools.islice(reader, TRANSCODE_BATCH))
+        if not batch:
+            break
+        writer.writerows(batch)
+        records += len(batch)
+        if records >= TRANSCODE_BATCH:
+            print(f"\r   {records:,} records processed", end="", flush=True)
+
+    if records >= TRANSCODE_BATCH:
+        print()
+    return records
+
+
+def numbered_path(output_dest, number):
+    """Path of the n-th workbook when splitting into files (out.xlsx -> out_2.xlsx)."""
+    base = strip_compression(output_dest)
+    root, ext = os.path.splitext(base)
+    return f"{root}_{number}{ext}{output_dest[len(base):]}"
+
+
+def stream_to_excel(chunks, output_dest, writer='openpyxl', split='sheets',
+                    max_rows=EXCEL_MAX_ROWS, write_header=True):
+    """Write DataFrame chunks to an Excel file as they are read.
+
+    Rows are serialized as they arrive (by openpyxl's write-only mode, or
+    directly as XLSX XML with writer='xml'), so memory is bounded by the
+    chunk size rather than the file size. When a sheet reaches max_rows
+    (header included), writing continues on a new sheet, or in a new
+    workbook file with split='files', starting with the header again.
+    With write_header=False (input without a header row) no header is
+    written. Returns (rows, columns, parts).
+    """
+    if split == 'files':
+        workbook = SplitFilesWriter(writer, output_dest)
+        titles = itertools.repeat('Sheet1')
+    else:
+        workbook = WRITERS[writer](output_dest)
+        titles = (f'Sheet{number}' for number in itertools.count(1))
+
+    rows, columns, parts = write_sheet(workbook, chunks, titles, max_rows, write_header)
+    workbook.close()
+    return rows, columns, parts
+
+
+def report_parts(output_dest, parts, split):
+    """Tell the user where rows beyond one sheet's limit ended up."""
+    if parts == 1:
+        return
+    if split == 'files':
+        print(f"   Split into {parts} files: {output_dest}, "
+              f"{numbered_path(output_dest, 2)} ... {numbered_path(output_dest, parts)}")
+    else:
+        print(f"   Split into {parts} sheets (Sheet1 ... Sheet{parts})")
+
+
+def sheet_base(path):
+    """Worksheet name for an input file: its name without extension, made valid."""
+    name = os.path.splitext(os.path.basename(strip_compression(path)))[0]
+    return INVALID_SHEET_CHARACTERS.sub('_', name).strip("'") or 'Sheet'
+
+
+def unique_title(base, taken):
+    """A worksheet name of at most 31 characters not yet in `taken`, which is updated.
+
+    Excel compares sheet names case-insensitively; clashes get ' (2)', ' (3)', ...
+    """
+    title = base[:SHEET_TITLE_LENGTH]
+    number = 1
+    while title.lower() in taken:
+        number += 1
+        suffix = f" ({number})"
+        title = base[:SHEET_TITLE_LENGTH - len(suffix)] + suffix
+    taken.add(title.lower())
+    return title
+
+
+def write_sheet(workbook, chunks, titles, max_rows=EXCEL_MAX_ROWS, write_header=True):
+    """Write DataFrame chunks to new worksheets of an open stream writer.
+
+    The first sheet is named next(titles). Rows beyond max_rows (header
+    included) continue on further sheets named by the following titles,
+    each starting with the header again unless write_header is False.
+    Returns (rows, columns, sheets).
+    """
+    workbook.add_sheet(next(titles))
+
+    header = None
+    sheets = 1
+    sheet_rows = 0
+    rows = 0
+    for chunk in chunks:
+        if header is None:
+            header = [str(column) for column in chunk.columns]
+            if write_header:
+                workbook.append(header)
+                sheet_rows = 1
+
+        for row in chunk_rows(chunk):
+            if sheet_rows == max_rows:
+                sheets += 1
+                workbook.add_sheet(next(titles))
+                sheet_rows = 0
+                if write_header:
+                    workbook.append(header)
+                    sheet_rows = 1
+
+            workbook.append(row)
+            sheet_rows += 1
+
+        rows += len(chunk)
+        print(f"\r   {rows:,} rows processed", end="", flush=True)
+
+    print()
+    return rows, len(header or []), sheets
+
+
+def parse_delimiter(delimiter_arg, allow_auto=False):
+    """Delimiter character for a name like 'comma' or a single character.
+
+    Returns None for 'auto' if allow_auto is set. Raises ValueError.
+    """
+    if allow_auto and delimiter_arg.lower() == 'auto':
+        return None
+    delimiter = DELIMITERS.get(delimiter_arg.lower(), delimiter_arg)
+    if len(delimiter) != 1:
+        raise ValueError(f"Delimiter must be a single character, got '{delimiter}'")
+    return delimiter
+
+
+def parse_convert_options(options):
+    """Validate the options shared by convert() and convert_combined().
+
+    Returns a dict with writer, quoting, split, chunksize, max_rows, ranges
+    and read_options. Raises ValueError, or LookupError for an unknown
+    encoding.
+    """
+    writer = str(options.get('writer', 'openpyxl')).lower()
+    if writer not in WRITERS:
+        raise ValueError(f"Unknown writer '{writer}' (choose from {', '.join(WRITERS)})")
+    quoting = QUOTING.get(str(options.get('quoting', 'minimal')).lower())
+    if quoting is None:
+        raise ValueError(f"--quoting must be one of {', '.join(QUOTING)}")
+
+    # Where rows go once a sheet is full
+    split = str(options.get('split', 'sheets')).lower()
+    if split not in ('sheets', 'files'):
+        raise ValueError(f"--split must be 'sheets' or 'files', got '{split}'")
+
+    return {
+        'writer': writer,
+        'quoting': quoting,
+        'split': split,
+        'chunksize': int_option(options, 'chunksize', DEFAULT_CHUNKSIZE, 1),
+        'max_rows': int_option(options, 'max-rows', EXCEL_MAX_ROWS, 2, EXCEL_MAX_ROWS),
+        'ranges': int_option(options, 'ranges', 1, 1),
+        'read_options': parse_read_options(options),
+    }
+
+
+def combine_inputs(input_source):
+    """Input files for --combine: comma-separated files, globs or directories."""
+    inputs = []
+    for part in input_source.split(','):
+        if part:
+            inputs.extend(expand_inputs(part) if is_batch_input(part) else [part])
+    return inputs
+
+
+def convert_combined(input_source, output_dest, delimiter_arg, options):
+    """Stream several inputs into one workbook, one worksheet per input.
+
+    Each input is read in chunks and written to its own sheet as it is read,
+    so memory is bounded by the chunk size and the workbook is written once
+    instead of being reopened per input. Returns False on failure, leaving
+    no partial workbook behind.
+    """
+    import pandas as pd
+
+    unsupported = [name for name in COMBINE_UNSUPPORTED if name in options]
+    if unsupported:
+        print(f"❌ Error: --{unsupported[0]} can't be used with --combine")
+        return False
+    try:
+        settings = parse_convert_options(options)
+        delimiter = parse_delimiter(delimiter_arg, allow_auto=True)
+    except (ValueError, LookupError) as e:
+        print(f"❌ Error: {e}")
+        return False
+    writer = settings['writer']
+    chunksize = settings['chunksize']
+    max_rows = settings['max_rows']
+    read_options = settings['read_options']
+    auto = delimiter is None
+
+    if output_dest.lower() in CLIPBOARD_NAMES or is_text_output(output_dest):
+        print("❌ Error: --combine writes an Excel workbook, e.g. report.xlsx")
+        return False
+
+    inputs = combine_inputs(input_source)
+    if not inputs:
+        print(f"❌ Error: No input files match '{input_source}'")
+        return False
+    if any(same_file(path, output_dest) for path in inputs):
+        print(f"❌ Error: Output {output_dest} is one of the inputs, choose another name")
+        return False
+
+    print(f"💾 Combining {len(inputs)} files into {output_dest}...")
+    workbook = WRITERS[writer](output_dest)
+    taken = set()
+    total = 0
+    path = inputs[0]
+    try:
+        for path in inputs:
+            title = unique_title(sheet_base(path), taken)
+            print(f"📖 Reading {path} into sheet '{title}'...")
+
+            file_delimiter, file_options = delimiter, read_options
+            if auto:
+                file_delimiter, file_options = apply_sniffed(read_sample(path), read_options)
+
+            # Decompresses inputs recognized by extension or content
+            with open_input(path) as source:
+                chunks = read_chunks(source, file_delimiter, chunksize, file_options)
+                # Overflow sheets are named 'title (2)', 'title (3)', ...
+                titles = itertools.chain(
+                    [title], (unique_title(title, taken) for _ in itertools.count()))
+                rows, _, sheets = write_sheet(workbook, chunks, titles, max_rows,
+                                              file_options.get('header', 'infer') is not None)
+            total += rows
+            if sheets > 1:
+                print(f"   Continued on {sheets - 1} more sheet(s)")
+
+        workbook.close()
+    except Exception as e:
+        if isinstance(e, FileNotFoundError):
+            print(f"❌ Error: File '{path}' not found")
+        elif isinstance(e, (pd.errors.ParserError, csv.Error)):
+            print(f"❌ Error: Failed to parse {path} - {e}")
+        else:
+            print(f"❌ Error: {path}: {e}")
+        with contextlib.suppress(Exception):
+            workbook.close()
+        with contextlib.suppress(OSError):
+            os.remove(output_dest)
+        return False
+
+    print(f"   Wrote {total:,} rows to {len(taken)} sheets")
+    print(f"✅ Success! Created {output_dest}")
+
+
+def file_state(path):
+    """(size, mtime in ns) of a file, the cheap part of its fingerprint."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_parts(output_dest):
+    """An output file and the numbered files --split=files continued it in."""
+    parts = [output_dest]
+    while os.path.exists(numbered_path(output_dest, len(parts) + 1)):
+        parts.append(numbered_path(output_dest, len(parts) + 1))
+    return parts
+
+
+class ConversionCache:
+    """Remembers which input and options produced an output file.
+
+    An output is up to date when all its files (every part with
+    split_files) still have the size and mtime they were written with, the
+    options are the same, and the input is unchanged: same size and mtime,
+    or else the same SHA-256, so an identical re-download still counts as
+    unchanged. The input is only hashed once its size or mtime changed, so
+    a plain conversion reads it just once.
+    """
+
+    def __init__(self, input_source, output_dest, key, split_files=False):
+        self.input_source = os.path.abspath(input_source)
+        self.output_dest = os.path.abspath(output_dest)
+        self.key = key
+        self.split_files = split_files
+        name = hashlib.sha256(self.output_dest.encode('utf-8')).hexdigest()[:24]
+        self.path = os.path.join(CACHE_DIR, f"{name}.json")
+        self.digest = None
+
+    def read(self):
+        """The cache entry for this output, or None."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def output_states(self):
+        """{path: [size, mtime]} of every file of the output."""
+        paths = output_parts(self.output_dest) if self.split_files else [self.output_dest]
+        return {path: file_state(path) for path in paths}
+
+    def fresh_rows(self):
+        """Rows written by the cached conversion if the output is up to date, else None."""
+        entry = self.read()
+        try:
+            if (entry is None or entry['input'] != self.input_source or entry['key'] != self.key
+                    or entry['output_states'] != {path: file_state(path)
+                                                  for path in entry['output_states']}):
+                return None
+            if entry['input_state'] != file_state(self.input_source):
+                self.digest = file_sha256(self.input_source)
+                if entry['sha256'] != self.digest:
+                    return None
+                # Same content, new mtime: remember it so the next check is cheap
+                self.store(entry['rows'])
+            return entry['rows']
+        except (OSError, KeyError, TypeError, AttributeError):
+            return None
+
+    def store(self, rows):
+        """Record a finished conversion; failures (e.g. read-only dirs) are ignored.
+
+        The input's hash is kept from the previous entry while the input's
+        size and mtime are unchanged; it is only computed when they change
+        (see fresh_rows).
+        """
+        tmp_file = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            input_state = file_state(self.input_source)
+            digest = self.digest
+            previous = self.read()
+            if (digest is None and previous is not None
+                    and previous.get('input') == self.input_source
+                    and previous.get('input_state') == input_state):
+                digest = previous.get('sha256')
+            entry = {
+                'input': self.input_source,
+                'input_state': input_state,
+                'sha256': digest,
+                'key': self.key,
+                'output_states': self.output_states(),
+                'rows': rows,
+            }
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=1)
+            os.replace(tmp_file, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+
+def conversion_key(delimiter_arg, output_delimiter_arg, options):
+    """Cache key for the settings of a conversion."""
+    settings = {name: value for name, value in options.items() if name not in UNCACHED_OPTIONS}
+    return json.dumps([delimiter_arg, output_delimiter_arg, settings], sort_keys=True)
+
+
+def convert_cached(input_source, output_dest, delimiter_arg, output_delimiter_arg, options):
+    """convert(), skipped when the output is already up to date.
+
+    Only file to file conversions are cached. Returns (rows, cached).
+    """
+    if (input_source.lower() in CLIPBOARD_NAMES or output_dest.lower() in CLIPBOARD_NAMES
+            or output_dest == STDIO or not os.path.isfile(input_source)):
+        return convert(input_source, output_dest, delimiter_arg, output_delimiter_arg, options), False
+
+    cache = ConversionCache(input_source, output_dest,
+                            conversion_key(delimiter_arg, output_delimiter_arg, options),
+                            str(options.get('split', 'sheets')).lower() == 'files')
+    if 'force' not in options:
+        rows = cache.fresh_rows()
+        if rows is not None:
+            print(f"⏭️  {output_dest} is up to date, skipping (--force to convert anyway)")
+            return rows, True
+
+    rows = convert(input_source, output_dest, delimiter_arg, output_delimiter_arg, options)
+    if rows is not None:
+        cache.store(rows)
+    return rows, False
+
+
+def is_batch_input(input_source):
+    """Whether the input names several files (a directory or a glob pattern)."""
+    if os.path.isfile(input_source):
+        return False
+    return os.path.isdir(input_source) or any(c in input_source for c in '*?[')
+
+
+def expand_inputs(input_source):
+    """Input files of a directory or glob pattern, sorted."""
+    if os.path.isdir(input_source):
+        paths = [os.path.join(input_source, name) for name in os.listdir(input_source)
+                 if name.lower().endswith(INPUT_EXTENSIONS)]
+    else:
+        paths = glob.glob(input_source)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def batch_outputs(inputs, output_dir, ext):
+    """Output path for each input: output_dir/<name>.<ext>, numbered on clashes."""
+    outputs = []
+    seen = set()
+    for path in inputs:
+        name = os.path.splitext(os.path.basename(strip_compression(path)))[0]
+        output = os.path.join(output_dir, f"{name}.{ext}")
+        number = 1
+        while output in seen:
+            number += 1
+            output = numbered_path(os.path.join(output_dir, f"{name}.{ext}"), number)
+        seen.add(output)
+        outputs.append(output)
+    return outputs
+
+
+def importable_module():
+    """This module as registered in sys.modules, for pickling to pool workers.
+
+    The runner registers snippets under their file name. When it couldn't
+    (or this file was loaded some other way), the module is loaded once more
+    under its own name. Raises ValueError if another module owns that name,
+    since workers would import that one instead.
+    """
+    module = sys.modules.get(__name__)
+    if module is not None and vars(module) is globals():
+        return module
+
+    path = os.path.realpath(__file__)
+    spec = None if module is not None else importlib.util.find_spec(__name__)
+    if module is not None or (spec is not None and os.path.realpath(spec.origin or '') != path):
+        raise ValueError(f"Can't convert in parallel: the module name '{__name__}' "
+                         f"is taken by another module, rename this snippet")
+
+    spec = importlib.util.spec_from_file_location(__name__, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[__name__] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def importable_by_workers():
+    """Let spawned pool workers import this module by name while the pool runs.
+
+    Workers started with spawn (the default on macOS and Windows) unpickle
+    functions by importing their module from sys.path. The snippets
+    directory is appended, so it can't shadow other modules, and removed
+    again afterwards.
+    """
+    snippets_dir = os.path.dirname(os.path.abspath(__file__))
+    if snippets_dir in sys.path:
+        yield
+        return
+    sys.path.append(snippets_dir)
+    try:
+        yield
+    finally:
+        with contextlib.suppress(ValueError):
+            sys.path.remove(snippets_dir)
+
+
+def init_worker():
+    """Process pool initializer: import pandas once per worker, no prompts."""
+    import pandas  # noqa: F401
+
+    sys.stdin = open(os.devnull, 'r')
+
+
+def convert_file(job):
+    """Convert one file of a batch in a pool worker, capturing its output.
+
+    Returns a dict with input, output, rows (None on failure), cached,
+    seconds and the captured log.
+    """
+    from io import StringIO
+
+    input_source, output_dest, delimiter_arg, output_delimiter_arg, options = job
+    log = StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        rows, cached = convert_cached(input_source, output_dest, delimiter_arg,
+                                      output_delimiter_arg, options)
+    return {'input': input_source, 'output': output_dest, 'rows': rows, 'cached': cached,
+            'seconds': time.perf_counter() - start, 'log': log.getvalue()}
+
+
+def failure_reason(log):
+    """The last error message in a captured conversion log."""
+    errors = [line.strip() for line in log.splitlines() if line.strip().startswith('❌')]
+    if not errors:
+        return "conversion failed"
+    return errors[-1].replace('❌ Error: ', '').replace('❌ ', '')
+
+
+def convert_many(input_source, output_dir, delimiter_arg, output_delimiter_arg, options):
+    """Convert every file of a directory or glob pattern into output_dir.
+
+    Files are converted on a process pool. pandas is imported here once
+    before the pool starts, so forked workers don't import it again; each
+    worker then converts many files. Prints per-file results and an
+    aggregate summary; returns False if any file failed.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    inputs = expand_inputs(input_source)
+    if not inputs:
+        print(f"❌ Error: No input files match '{input_source}'")
+        return False
+
+    if output_dir.lower() in CLIPBOARD_NAMES or os.path.isfile(output_dir):
+        print(f"❌ Error: Output must be a directory when converting several files, got '{output_dir}'")
+        return False
+
+    # csv.gz etc. compress the output
+    ext = str(options.get('ext', 'xlsx')).lstrip('.').lower()
+    base_ext = strip_compression(f"x.{ext}")[2:]
+    if base_ext not in BATCH_FORMATS or (base_ext == 'xlsx' and ext != base_ext):
+        print(f"❌ Error: --ext must be one of {', '.join(BATCH_FORMATS)} "
+              f"(text formats may add .gz/.bz2/.xz/.zst), got '{ext}'")
+        return False
+
+    try:
+        workers = int_option(options, 'workers', os.cpu_count() or 1, 1)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    workers = min(workers, len(inputs))
+
+    # Writing an output that is also an input would empty it
+    outputs = batch_outputs(inputs, output_dir, ext)
+    input_paths = {os.path.realpath(path) for path in inputs}
+    overwritten = [output for output in outputs if os.path.realpath(output) in input_paths]
+    if overwritten:
+        print(f"❌ Error: {overwritten[0]} would overwrite an input file, "
+              f"choose another output directory or --ext")
+        return False
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, output, delimiter_arg, output_delimiter_arg, options)
+            for path, output in zip(inputs, outputs)]
+
+    import pandas  # noqa: F401  (inherited by forked workers)
+
+    try:
+        module = importable_module()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    print(f"📖 Converting {len(jobs)} files to {output_dir} with {workers} worker(s)...")
+
+    start = time.perf_counter()
+    rows = 0
+    cached = 0
+    failures = []
+    with importable_by_workers(), \
+            ProcessPoolExecutor(max_workers=workers, initializer=module.init_worker) as pool:
+        futures = {pool.submit(module.convert_file, job): job for job in jobs}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'input': job[0], 'output': job[1], 'rows': None, 'cached': False,
+                          'seconds': 0.0, 'log': f"❌ Error: {e}"}
+
+            if result['rows'] is None:
+                failures.append(result)
+                print(f"❌ [{done}/{len(jobs)}] {result['input']}: {failure_reason(result['log'])}")
+            elif result['cached']:
+                cached += 1
+                print(f"⏭️  [{done}/{len(jobs)}] {result['input']}: {result['output']} is up to date")
+            else:
+                rows += result['rows']
+                print(f"✅ [{done}/{len(jobs)}] {result['input']} -> {result['output']} "
+                      f"({result['rows']:,} rows, {result['seconds']:.1f}s)")
+
+    elapsed = time.perf_counter() - start
+    converted = len(jobs) - len(failures) - cached
+    print(f"\n📊 Converted {converted}/{len(jobs)} files, {rows:,} rows in {elapsed:.1f}s "
+          f"({rows / elapsed:,.0f} rows/s)")
+    if cached:
+        print(f"   {cached} file(s) up to date, skipped (--force to convert anyway)")
+
+    if failures:
+        print(f"❌ {len(failures)} file(s) failed:")
+        for result in failures:
+            print(f"   {result['input']}: {failure_reason(result['log'])}")
+        return False
+
+    print(f"✅ Success! Wrote {converted} files to {output_dir}")
+
 
 def run(args):
     """Convert CSV to Excel."""
-    import pandas as pd
-    import pyperclip
-    from io import StringIO, BytesIO
+    try:
+        args, options = split_options(args)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
 
-    if len(args) < 2 or len(args) > 3:
-        print("❌ Error: Expected 2-3 arguments")
-        print("Usage: <input> <output> [delimiter]")
+    if len(args) < 2 or len(args) > 4:
+        print("❌ Error: Expected 2-4 arguments")
+        print("Usage: <input> <output> [delimiter] [output_delimiter] "
+              "[--stream] [--chunksize=N] [--writer=xml] [--split=files] [--quoting=all] "
+              "[--engine=pyarrow] [--strings] [--dtype=T] [--usecols=a,b] [--encoding=E] "
+              "[--mmap] [--ranges=N] [--max-rows=N] [--workers=N] [--ext=csv] [--combine] "
+              "[--force]")
         print("Example: data.csv output.xlsx")
         print("Example: clipboard output.xlsx comma")
+        print("Example: data.csv output.xlsx auto")
         print("Example: data.csv clipboard tab")
-        return
+        return False
 
     input_source = args[0]
     output_dest = args[1]
-    delimiter_arg = args[2] if len(args) == 3 else 'tab'
-
-    # Map delimiter names to actual characters
-    delimiter_map = {
-        'tab': '\t',
-        'comma': ',',
-        ',': ',',
-        'semicolon': ';',
-        ';': ';',
-        'pipe': '|',
-        '|': '|',
-        'space': ' ',
-    }
+    delimiter_arg = args[2] if len(args) >= 3 else 'tab'
+    output_delimiter_arg = args[3] if len(args) == 4 else 'tab'
 
-    delimiter = delimiter_map.get(delimiter_arg.lower(), delimiter_arg)
+    if 'combine' in options:
+        if len(args) == 4:
+            print("❌ Error: --combine writes an Excel workbook, it takes no output delimiter")
+            return False
+        return convert_combined(input_source, output_dest, delimiter_arg, options)
+
+    if is_batch_input(input_source):
+        return convert_many(input_source, output_dest, delimiter_arg, output_delimiter_arg, options)
+
+    if output_dest == STDIO:
+        # The data goes to stdout, so messages go to stderr
+        stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            rows = convert(input_source, output_dest, delimiter_arg, output_delimiter_arg,
+                           options, stdout)
+        return False if rows is None else None
+
+    rows, _ = convert_cached(input_source, output_dest, delimiter_arg,
+                             output_delimiter_arg, options)
+    if rows is None:
+        return False
 
-    # Validate delimiter is a single character
-    if len(delimiter) != 1:
-        print(f"❌ Error: Delimiter must be a single character, got '{delimiter}'")
-        return
+
+def convert(input_source, output_dest, delimiter_arg, output_delimiter_arg, options,
+            stdout=None):
+    """Convert one input to one output.
+
+    `stdout` is the stream '-' output is written to (default sys.stdout).
+    Returns the number of rows (records for delimited output) written, or
+    None if the conversion failed; the reason has been printed. pandas and
+    pyperclip are only imported by the paths that need them, so delimited
+    file and pipe conversions start quickly.
+    """
+    from io import StringIO
+
+    # Streaming is enabled by --stream or by giving a chunk size or writer
+    stream = 'stream' in options or 'chunksize' in options or 'writer' in options
+
+    # Memory-mapped input; --ranges implies it
+    use_mmap = 'mmap' in options or 'ranges' in options
+
+    # 'auto' is resolved from a sample of the input once it is opened
+    try:
+        settings = parse_convert_options(options)
+        delimiter = parse_delimiter(delimiter_arg, allow_auto=True)
+        output_delimiter = parse_delimiter(output_delimiter_arg)
+    except (ValueError, LookupError) as e:
+        print(f"❌ Error: {e}")
+        return None
+    writer = settings['writer']
+    quoting = settings['quoting']
+    split = settings['split']
+    chunksize = settings['chunksize']
+    max_rows = settings['max_rows']
+    ranges = settings['ranges']
+    read_options = settings['read_options']
+    auto = delimiter is None
+
+    # Opening the output would empty the input before it is read
+    if (input_source != STDIO and input_source.lower() not in CLIPBOARD_NAMES
+            and output_dest != STDIO and output_dest.lower() not in CLIPBOARD_NAMES
+            and same_file(input_source, output_dest)):
+        print(f"❌ Error: Output {output_dest} is the input file, choose another name")
+        return None
 
     try:
         # Read input
-        if input_source.lower() in ['clipboard', 'clip', 'cb']:
+        if input_source.lower() in CLIPBOARD_NAMES:
             print(f"📋 Reading from clipboard...")
+            import pyperclip
             csv_data = pyperclip.paste()
             if not csv_data.strip():
                 print("❌ Error: Clipboard is empty")
-                return
-            df = pd.read_csv(StringIO(csv_data), sep=delimiter)
+                return None
+            reader_input = StringIO(csv_data)
             source_name = "clipboard"
+            compression = None
+        elif input_source == STDIO:
+            print(f"📖 Reading from stdin...")
+            reader_input = open_input(STDIO)
+            source_name = "stdin"
+            compression = None
         else:
             print(f"📖 Reading {input_source}...")
-            df = pd.read_csv(input_source, sep=delimiter)
+            reader_input = input_source
             source_name = input_source
+            compression = detect_compression(input_source)
+            if compression:
+                # The parsers read the decompressed stream
+                print(f"   Decompressing {compression} input on the fly")
+                reader_input = open_input(input_source)
+
+        if auto:
+            if source_name == "clipboard":
+                sample = csv_data[:SNIFF_BYTES]
+            elif source_name == "stdin":
+                sample = reader_input.peek(SNIFF_BYTES)[:SNIFF_BYTES]
+            else:
+                sample = read_sample(input_source)
+            delimiter, read_options = apply_sniffed(sample, read_options)
+
+        encoding = read_options.get('encoding', 'utf-8')
+        write_header = read_options.get('header', 'infer') is not None
+
+        if use_mmap and (source_name in ("clipboard", "stdin") or compression):
+            print("⚠️  --mmap and --ranges need an uncompressed input file, reading it normally")
+            use_mmap = False
+            ranges = 1
+
+        # Delimited text output: transcode record by record, no DataFrame
+        if is_text_output(output_dest):
+            if source_name == "clipboard":
+                source = lines = reader_input
+            elif source_name == "stdin":
+                source = lines = io.TextIOWrapper(reader_input, encoding=encoding, newline='')
+            elif use_mmap and not is_wide_encoding(encoding):
+                source = open_mapped(input_source)
+                lines = mapped_lines(source, encoding)
+            else:
+                source = lines = open_input(input_source, encoding)
+
+            if output_dest.lower() in CLIPBOARD_NAMES:
+                # Excel binary can't be copied to the clipboard, so copy delimited text
+                print(f"💾 Writing to clipboard...")
+                output = StringIO()
+            elif output_dest == STDIO:
+                print(f"💾 Writing to stdout...")
+                output = stdout or sys.stdout
+            else:
+                print(f"💾 Writing to {output_dest}...")
+                output = open_output(output_dest)
+
+            with contextlib.ExitStack() as streams:
+                streams.enter_context(source)
+                if output_dest != STDIO:
+                    # stdout stays open for whoever comes after us in the pipeline
+                    streams.enter_context(output)
+                rows = transcode_csv(lines, output, delimiter, output_delimiter, quoting,
+                                     read_options.get('quotechar', '"'),
+                                     read_options.get('skipinitialspace', False))
+                if output_dest.lower() in CLIPBOARD_NAMES:
+                    import pyperclip
+                    pyperclip.copy(output.getvalue())
+                output.flush()
+
+            print(f"   Wrote {rows} records")
+            if output_dest.lower() in CLIPBOARD_NAMES:
+                print(f"✅ Success! Copied as {delimiter_name(output_delimiter)}-delimited CSV to clipboard")
+            elif output_dest == STDIO:
+                print(f"✅ Success! Wrote {delimiter_name(output_delimiter)}-delimited CSV to stdout")
+            else:
+                print(f"✅ Success! Created {output_dest} ({delimiter_name(output_delimiter)}-delimited)")
+            return rows
+
+        import pandas as pd
+
+        if use_mmap and ranges == 1:
+            reader_input, read_options = mapped_input(input_source, read_options)
+
+        # Streaming: read and write chunk by chunk, never holding the whole file
+        if stream:
+            print(f"💾 Streaming to {output_dest} in chunks of {chunksize:,} rows...")
+            if ranges > 1:
+                chunks = range_chunks(input_source, delimiter, ranges, read_options)
+            else:
+                chunks = read_chunks(reader_input, delimiter, chunksize, read_options)
+            rows, columns, parts = stream_to_excel(chunks, output_dest, writer, split, max_rows,
+                                                   write_header)
+            print(f"   Wrote {rows} rows and {columns} columns")
+            report_parts(output_dest, parts, split)
+            print(f"✅ Success! Created {output_dest}")
+            return rows
+
+        if ranges > 1:
+            print(f"   Parsing {ranges} ranges in parallel...")
+            df = pd.concat(range_chunks(input_source, delimiter, ranges, read_options),
+                           ignore_index=True)
+        else:
+            df = pd.read_csv(reader_input, sep=delimiter, **read_options)
 
         print(f"   Found {len(df)} rows and {len(df.columns)} columns")
 
         # Write output
-        if output_dest.lower() in ['clipboard', 'clip', 'cb']:
-            print(f"💾 Writing to clipboard...")
-            # Convert to Excel in memory
-            output = BytesIO()
-            df.to_excel(output, index=False, engine='openpyxl')
-            output.seek(0)
-
-            # Note: We can't copy binary Excel to clipboard, so convert to CSV
-            csv_output = df.to_csv(index=False, sep='\t')
-            pyperclip.copy(csv_output)
-            print(f"✅ Success! Copied as tab-delimited CSV to clipboard")
-            print(f"   (Excel binary can't be copied to clipboard)")
+        if len(df) >= max_rows:
+            # One sheet can't hold it all: roll over to more sheets/files
+            print(f"💾 Writing to {output_dest} (more than {max_rows - 1:,} rows per sheet)...")
+            rows, columns, parts = stream_to_excel([df], output_dest, writer, split, max_rows,
+                                                   write_header)
+            report_parts(output_dest, parts, split)
+            print(f"✅ Success! Created {output_dest}")
         else:
             print(f"💾 Writing to {output_dest}...")
-            df.to_excel(output_dest, index=False, engine='openpyxl')
+            df.to_excel(output_dest, index=False, header=write_header, engine='openpyxl')
             print(f"✅ Success! Created {output_dest}")
+        return len(df)
 
     except FileNotFoundError:
         print(f"❌ Error: File '{input_source}' not found")
-    except pd.errors.ParserError as e:
+        return None
+    except parse_errors() as e:
         print(f"❌ Error: Failed to parse CSV - {e}")
-        print(f"   Check if delimiter '{delimiter}' is correct")
+        print(f"   Check if delimiter '{delimiter}' is correct, or use auto")
+        return None
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`)
+        print("⚠️  Output pipe closed, stopping")
+        discard_output(stdout or sys.stdout)
+        return None
+    except UnicodeDecodeError as e:
+        print(f"❌ Error: Input is not valid {read_options.get('encoding', 'utf-8')} - {e}")
+        print("   Pass the encoding with --encoding=..., or use the auto delimiter")
+        return None
     except Exception as e:
-        print(f"❌ Error: {e}")
\ No newline at end of file
+        print(f"❌ Error: {e}")
+        return None
\ No newline at end of file
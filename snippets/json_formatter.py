@@ -3,37 +3,79 @@ JSON Pretty Formatter
 Reads a JSON file, formats it nicely, and copies to clipboard.
 """
 
+import contextlib
+import os
+import sys
+
 TITLE = "JSON Pretty Formatter"
 
 DESCRIPTION = """Read JSON from a file or clipboard, format it beautifully, and copy to clipboard.
 
 Usage:
+  <json_file> [output]
   <json_file>    - Read from file
   clipboard      - Read from clipboard
   clip           - Read from clipboard (short)
+  -              - Read from stdin
+
+Output (optional):
+  <file>         - Write the formatted JSON to a file instead of showing it
+  -              - Write the formatted JSON to stdout (messages go to stderr)
 
 Examples:
   data.json
   clipboard
   clip
+  data.json pretty.json
+  - -            # In a pipeline: curl ... | <runner> - - | less
   
 Required packages: pyperclip
 Install with: pip install pyperclip
 """
 
+REQUIRES = ['pyperclip']
+
+# Input/output name for stdin/stdout
+STDIO = '-'
+
+
 def run(args):
     """Format JSON and copy to clipboard."""
-    import json
-    import pyperclip
-
-    if len(args) != 1:
-        print("❌ Error: Expected 1 argument")
-        print("Usage: <json_file> or 'clipboard'")
+    if len(args) not in (1, 2):
+        print("❌ Error: Expected 1-2 arguments")
+        print("Usage: <json_file> or 'clipboard' or '-', optionally followed by an output file or '-'")
         print("Example: data.json")
         print("Example: clipboard")
-        return
+        print("Example: - -")
+        return False
 
     input_source = args[0]
+    output_dest = args[1] if len(args) == 2 else None
+
+    if output_dest == STDIO:
+        # The JSON goes to stdout, so messages go to stderr
+        stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            return format_json(input_source, output_dest, stdout)
+    return format_json(input_source, output_dest)
+
+
+def discard_output(stream):
+    """Point a closed pipe's descriptor at devnull so flushing at exit doesn't fail."""
+    try:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+def format_json(input_source, output_dest=None, stdout=None):
+    """Read, format and show or write JSON; returns False on errors.
+
+    Without output_dest the JSON is shown and optionally copied to the
+    clipboard. Otherwise it is written to that file, or to `stdout` for '-'.
+    """
+    import json
+    import pyperclip
 
     try:
         # Determine input source
@@ -42,9 +84,13 @@ def run(args):
             json_string = pyperclip.paste()
             if not json_string.strip():
                 print("❌ Error: Clipboard is empty")
-                return
+                return False
             data = json.loads(json_string)
             source_name = "clipboard"
+        elif input_source == STDIO:
+            print("📖 Reading from stdin...")
+            data = json.load(sys.stdin)
+            source_name = "stdin"
         else:
             # Read JSON file
             print(f"📖 Reading {input_source}...")
@@ -52,6 +98,21 @@ def run(args):
                 data = json.load(f)
             source_name = input_source
 
+        # Write to a file or stdout, encoding piece by piece
+        if output_dest == STDIO:
+            json.dump(data, stdout, indent=2, ensure_ascii=False)
+            stdout.write("\n")
+            stdout.flush()
+            print("✅ Wrote formatted JSON to stdout")
+            return
+        if output_dest:
+            print(f"💾 Writing to {output_dest}...")
+            with open(output_dest, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+            print(f"✅ Success! Created {output_dest}")
+            return
+
         # Format with indentation
         formatted = json.dumps(data, indent=2, ensure_ascii=False)
 
@@ -62,8 +123,11 @@ def run(args):
         print(formatted)
         print("="*60)
 
-        # Ask if user wants to copy
-        response = input("\n📋 Copy to clipboard? (y/n): ").strip().lower()
+        # Ask if user wants to copy (no answer when run non-interactively)
+        try:
+            response = input("\n📋 Copy to clipboard? (y/n): ").strip().lower()
+        except EOFError:
+            response = ''
 
         if response in ['y', 'yes']:
             pyperclip.copy(formatted)
@@ -73,7 +137,15 @@ def run(args):
 
     except FileNotFoundError:
         print(f"❌ Error: File '{input_source}' not found")
+        return False
     except json.JSONDecodeError as e:
         print(f"❌ Error: Invalid JSON - {e}")
+        return False
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`)
+        print("⚠️  Output pipe closed, stopping")
+        discard_output(stdout or sys.stdout)
+        return False
     except Exception as e:
-        print(f"❌ Error: {e}")
\ No newline at end of file
+        print(f"❌ Error: {e}")
+        return False
\ No newline at end of file
@@ -105,7 +105,7 @@ def run(args):
     if len(args) == 0:
         print("❌ Error: No command specified")
         print("Usage: list | add <title> [priority] | status <priority> <status> | remove <priority>")
-        return
+        return False
 
     command = args[0].lower()
     todos = load_todos()
@@ -118,7 +118,7 @@ def run(args):
             if len(args) < 2:
                 print("❌ Error: Missing title")
                 print("Usage: add <title> [priority]")
-                return
+                return False
 
             # Parse title and priority
             if len(args) >= 3 and args[-1].isdigit():
@@ -159,19 +159,19 @@ def run(args):
                 print("❌ Error: Expected <priority> <status>")
                 print("Usage: status <priority> <status>")
                 print("Status: todo | progress | done")
-                return
+                return False
 
             try:
                 priority = int(args[1])
             except ValueError:
                 print(f"❌ Error: Invalid priority '{args[1]}'")
-                return
+                return False
 
             new_status = status_map.get(args[2].lower())
             if not new_status:
                 print(f"❌ Error: Invalid status '{args[2]}'")
                 print("Valid statuses: todo | progress | done")
-                return
+                return False
 
             # Find and update todo
             found = False
@@ -184,7 +184,7 @@ def run(args):
 
             if not found:
                 print(f"❌ Error: Todo with priority {priority} not found")
-                return
+                return False
 
             save_todos(todos)
             print(f"✅ Updated todo [Priority {priority}]: {old_status} → {new_status}")
@@ -193,13 +193,13 @@ def run(args):
             if len(args) != 2:
                 print("❌ Error: Expected <priority>")
                 print("Usage: remove <priority>")
-                return
+                return False
 
             try:
                 priority = int(args[1])
             except ValueError:
                 print(f"❌ Error: Invalid priority '{args[1]}'")
-                return
+                return False
 
             # Find and remove todo
             original_count = len(todos)
@@ -207,7 +207,7 @@ def run(args):
 
             if len(todos) == original_count:
                 print(f"❌ Error: Todo with priority {priority} not found")
-                return
+                return False
 
             save_todos(todos)
             print(f"✅ Removed todo [Priority {priority}]")
@@ -215,6 +215,8 @@ def run(args):
         else:
             print(f"❌ Error: Unknown command '{command}'")
             print("Available commands: list | add | status | remove")
+            return False
 
     except Exception as e:
-        print(f"❌ Error: {e}")
\ No newline at end of file
+        print(f"❌ Error: {e}")
+        return False
\ No newline at end of file